@@ -1,135 +1,276 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Query as OrmQuery, Session
+from typing import Any, Dict, Literal, Optional, Tuple, get_args
 from datetime import datetime
+from functools import partial
+import base64
+import json
 
-from ..models.database import get_db
+from ..core.cache import cached_json_response, response_cache, timed_json_response
+from ..models.database import get_db, run_in_db, run_in_read_session
 from ..models.schemas import Skill, SkillsResponse, SkillsQueryParams
 from ..models import database as db_models
 
 router = APIRouter(prefix="/api/v1/skills", tags=["skills"])
 
+SortName = Literal["latest", "hot", "used"]
+SourceName = Literal["github", "npm", "pypi", "huggingface", "all"]
+DEFAULT_PAGE_SIZE = 50
+
+
+# 响应按列投影为 Row 元组直接序列化，不经过 ORM 实体和 pydantic 模型；
+# 字段顺序与 schemas.Skill 一致，输出与原先逐字段构造模型时相同
+SKILL_FIELDS = (
+    "name",
+    "source",
+    "description",
+    "url",
+    "language",
+    "id",
+    "classification",
+    "created_at",
+    "updated_at",
+)
+METRIC_FIELDS = (
+    "stars",
+    "forks",
+    "downloads_day",
+    "downloads_week",
+    "downloads_month",
+    "likes",
+    "last_activity",
+    "score",
+)
+
+
+def _skill_columns() -> list:
+    skill = db_models.Skill
+    latest = db_models.SkillLatestMetrics
+    return [
+        *(getattr(skill, field) for field in SKILL_FIELDS),
+        *(getattr(latest, field) for field in METRIC_FIELDS),
+        # 外连接时区分“无指标行”与“指标全为空”
+        latest.skill_id.label("metrics_skill_id"),
+    ]
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    data = {field: getattr(row, field) for field in SKILL_FIELDS}
+    data["metrics"] = (
+        {field: getattr(row, field) for field in METRIC_FIELDS}
+        if row.metrics_skill_id is not None
+        else None
+    )
+    return data
+
+
+def sort_keys(sort: str):
+    """排序列及作为平局决胜的 rowid；升序 rowid 与索引条目的隐式顺序一致"""
+    if sort == "latest":
+        return db_models.Skill.updated_at, db_models.Skill.id
+    latest = db_models.SkillLatestMetrics
+    column = latest.score if sort == "hot" else latest.downloads_month
+    return column, latest.skill_id
+
+
+def build_skills_query(
+    db: Session, sort: str, source: str, after: Optional[Tuple[Any, int]] = None
+) -> OrmQuery:
+    """排序查询：每种 sort × source 组合都由对应索引直接按序扫描
+
+    after 为上一页最后一行的 (排序值, id)，按键集续读下一页。
+    """
+    skill = db_models.Skill
+    latest = db_models.SkillLatestMetrics
+
+    query = db.query(*_skill_columns()).select_from(skill)
+    if sort == "latest":
+        query = query.outerjoin(latest)
+        if source != "all":
+            query = query.filter(skill.source == source)
+    else:
+        # hot / used 从最新指标表的排序索引出发，再按主键回表取技能
+        query = query.join(latest)
+        if source != "all":
+            query = query.filter(latest.source == source)
+
+    value_column, id_column = sort_keys(sort)
+    if after is not None:
+        value, last_id = after
+        if value is None:
+            # 降序时 NULL 排在最后
+            query = query.filter(value_column.is_(None), id_column > last_id)
+        else:
+            # 值相同的行按 id 续读，之后还要读到排在最后的 NULL 行。
+            # 写成一个 OR 条件时 SQLite 无法按索引定位，只能从头扫描；
+            # 拆成 UNION ALL 后两段各自按索引定位，再归并两段的有序结果
+            query = query.filter(
+                value_column <= value,
+                or_(
+                    value_column < value,
+                    and_(value_column == value, id_column > last_id),
+                ),
+            ).union_all(query.filter(value_column.is_(None)))
+    return query.order_by(value_column.desc(), id_column)
+
+
+def encode_cursor(sort: str, source: str, value: Any, last_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, source, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, source: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_source, value, last_id = json.loads(
+            base64.urlsafe_b64decode(padded)
+        )
+        if sort == "latest" and value is not None:
+            value = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (cursor_sort, cursor_source) != (sort, source) or not isinstance(last_id, int):
+        raise HTTPException(status_code=400, detail="Cursor does not match query")
+    return value, last_id
+
+
+def _count_skills(db: Session, source: str) -> int:
+    query = db.query(func.coalesce(func.sum(db_models.SkillCount.total), 0))
+    if source != "all":
+        query = query.filter(db_models.SkillCount.source == source)
+    return query.scalar()
+
+
+def _list_skills(
+    db: Session, sort: str, source: str, limit: int, cursor: Optional[str]
+) -> Dict[str, Any]:
+    after = decode_cursor(cursor, sort, source) if cursor else None
+    # 多取一行判断是否还有下一页
+    rows = build_skills_query(db, sort, source, after).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        value_column, _ = sort_keys(sort)
+        next_cursor = encode_cursor(
+            sort, source, getattr(rows[-1], value_column.key), rows[-1].id
+        )
+
+    return {
+        "skills": [_row_to_dict(row) for row in rows],
+        "total": _count_skills(db, source),
+        "sort_by": sort,
+        "updated_at": datetime.utcnow(),
+        "next_cursor": next_cursor,
+    }
+
+
+def _page_params(
+    sort: str, source: str, limit: int, cursor: Optional[str]
+) -> Dict[str, Any]:
+    return {"sort": sort, "source": source, "limit": limit, "cursor": cursor or ""}
+
 
 @router.get("", response_model=SkillsResponse)
 async def get_skills(
-    sort: Literal["latest", "hot", "used"] = "latest",
-    source: Literal["github", "npm", "pypi", "huggingface", "all"] = "all",
-    limit: int = Query(50, ge=1, le=100),
+    sort: SortName = "latest",
+    source: SourceName = "all",
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
-    query = db.query(db_models.Skill)
-
-    if source != "all":
-        query = query.filter(db_models.Skill.source == source)
-
-    sort_column = None
-    if sort == "latest":
-        sort_column = db_models.Skill.updated_at.desc()
-    elif sort == "hot":
-        sort_column = db_models.SkillMetrics.downloads_week.desc()
-    elif sort == "used":
-        sort_column = db_models.SkillMetrics.downloads_month.desc()
-
-    skills = (
-        query.outerjoin(db_models.SkillMetrics).order_by(sort_column).limit(limit).all()
+    return await cached_json_response(
+        "skills",
+        _page_params(sort, source, limit, cursor),
+        lambda: run_in_db(_list_skills, db, sort, source, limit, cursor),
     )
 
-    skill_list = []
-    for skill in skills:
-        metrics = skill.metrics[-1] if skill.metrics else None
-        skill_data = Skill(
-            id=skill.id,
-            name=skill.name,
-            source=skill.source,
-            description=skill.description,
-            url=skill.url,
-            language=skill.language,
-            created_at=skill.created_at,
-            updated_at=skill.updated_at,
-        )
-        if metrics:
-            skill_data.metrics = db_models.SkillMetrics(
-                stars=metrics.stars,
-                forks=metrics.forks,
-                downloads_day=metrics.downloads_day,
-                downloads_week=metrics.downloads_week,
-                downloads_month=metrics.downloads_month,
-                likes=metrics.likes,
-                last_activity=metrics.last_activity,
+
+def _register_prewarm():
+    """每种 sort × source 的默认首页在爬取后预先序列化，请求直接命中缓存字节"""
+    for sort in get_args(SortName):
+        for source in get_args(SourceName):
+            response_cache.register_prewarm(
+                "skills",
+                _page_params(sort, source, DEFAULT_PAGE_SIZE, None),
+                partial(
+                    run_in_read_session,
+                    _list_skills,
+                    sort,
+                    source,
+                    DEFAULT_PAGE_SIZE,
+                    None,
+                ),
             )
-        skill_list.append(skill_data)
 
-    return SkillsResponse(
-        skills=skill_list,
-        total=query.count(),
-        sort_by=sort,
-        updated_at=datetime.utcnow(),
-    )
 
+_register_prewarm()
 
-@router.get("/{skill_id}", response_model=Skill)
-async def get_skill(skill_id: int, db: Session = Depends(get_db)):
-    skill = db.query(db_models.Skill).filter(db_models.Skill.id == skill_id).first()
-    if not skill:
-        from fastapi import HTTPException
 
+def _load_skill(db: Session, skill_id: int) -> Dict[str, Any]:
+    row = (
+        db.query(*_skill_columns())
+        .select_from(db_models.Skill)
+        .outerjoin(db_models.SkillLatestMetrics)
+        .filter(db_models.Skill.id == skill_id)
+        .first()
+    )
+    if not row:
         raise HTTPException(status_code=404, detail="Skill not found")
 
-    metrics = skill.metrics[-1] if skill.metrics else None
-    skill_data = Skill(
-        id=skill.id,
-        name=skill.name,
-        source=skill.source,
-        description=skill.description,
-        url=skill.url,
-        language=skill.language,
-        created_at=skill.created_at,
-        updated_at=skill.updated_at,
-    )
-    if metrics:
-        skill_data.metrics = db_models.SkillMetrics(
-            stars=metrics.stars,
-            forks=metrics.forks,
-            downloads_day=metrics.downloads_day,
-            downloads_week=metrics.downloads_week,
-            downloads_month=metrics.downloads_month,
-            likes=metrics.likes,
-            last_activity=metrics.last_activity,
-        )
-    return skill_data
+    return _row_to_dict(row)
 
 
-@router.get("/{skill_id}/history")
-async def get_skill_history(
-    skill_id: int, days: int = Query(30, ge=1, le=90), db: Session = Depends(get_db)
-):
-    skill = db.query(db_models.Skill).filter(db_models.Skill.id == skill_id).first()
-    if not skill:
-        from fastapi import HTTPException
+@router.get("/{skill_id}", response_model=Skill)
+async def get_skill(skill_id: int, db: Session = Depends(get_db)):
+    return await cached_json_response(
+        "skill", {"id": skill_id}, lambda: run_in_db(_load_skill, db, skill_id)
+    )
 
+
+def _load_history(db: Session, skill_id: int, days: int):
+    skill_name = (
+        db.query(db_models.Skill.name).filter(db_models.Skill.id == skill_id).scalar()
+    )
+    if skill_name is None:
         raise HTTPException(status_code=404, detail="Skill not found")
 
     from datetime import timedelta
 
     cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-    metrics = (
-        db.query(db_models.SkillMetrics)
-        .filter(
-            db_models.SkillMetrics.skill_id == skill_id,
-            db_models.SkillMetrics.recorded_at >= cutoff_date,
+    # 原始数据超过保留期后已汇总为日 / 周数据，三者时间段互不重叠
+    history = []
+    for model, time_column, resolution in (
+        (db_models.SkillMetrics, db_models.SkillMetrics.recorded_at, "raw"),
+        (db_models.SkillMetricsDaily, db_models.SkillMetricsDaily.period_start, "daily"),
+        (
+            db_models.SkillMetricsWeekly,
+            db_models.SkillMetricsWeekly.period_start,
+            "weekly",
+        ),
+    ):
+        rows = (
+            db.query(
+                time_column,
+                model.stars,
+                model.forks,
+                model.downloads_day,
+                model.downloads_week,
+                model.downloads_month,
+                model.likes,
+            )
+            .filter(model.skill_id == skill_id, time_column >= cutoff_date)
+            .order_by(time_column.desc())
+            .all()
         )
-        .order_by(db_models.SkillMetrics.recorded_at.desc())
-        .all()
-    )
-
-    return {
-        "skill_id": skill_id,
-        "skill_name": skill.name,
-        "days": days,
-        "history": [
+        history.extend(
             {
-                "recorded_at": m.recorded_at,
+                "recorded_at": getattr(m, time_column.key),
+                "resolution": resolution,
                 "stars": m.stars,
                 "forks": m.forks,
                 "downloads_day": m.downloads_day,
@@ -137,6 +278,21 @@ async def get_skill_history(
                 "downloads_month": m.downloads_month,
                 "likes": m.likes,
             }
-            for m in metrics
-        ],
+            for m in rows
+        )
+
+    return {
+        "skill_id": skill_id,
+        "skill_name": skill_name,
+        "days": days,
+        "history": history,
     }
+
+
+@router.get("/{skill_id}/history")
+async def get_skill_history(
+    skill_id: int, days: int = Query(30, ge=1, le=90), db: Session = Depends(get_db)
+):
+    return await timed_json_response(
+        lambda: run_in_db(_load_history, db, skill_id, days)
+    )
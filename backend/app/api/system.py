@@ -3,22 +3,19 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime
 
-from ..models.database import get_db
+from ..core.cache import cached_json_response, response_cache
+from ..models.database import get_db, run_in_db, run_in_read_session
 from ..models.schemas import StatsResponse, HealthResponse
 from ..models import database as db_models
 
 router = APIRouter(prefix="/api/v1", tags=["system"])
 
 
-@router.get("/stats", response_model=StatsResponse)
-async def get_stats(db: Session = Depends(get_db)):
-    total_skills = db.query(func.count(db_models.Skill.id)).scalar()
-
-    skills_by_source = (
-        db.query(db_models.Skill.source, func.count(db_models.Skill.id))
-        .group_by(db_models.Skill.source)
-        .all()
-    )
+def _load_stats(db: Session) -> StatsResponse:
+    skills_by_source = db.query(
+        db_models.SkillCount.source, db_models.SkillCount.total
+    ).all()
+    total_skills = sum(count for _, count in skills_by_source)
 
     last_updated = db.query(func.max(db_models.Skill.updated_at)).scalar()
 
@@ -29,15 +26,28 @@ async def get_stats(db: Session = Depends(get_db)):
     )
 
 
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(db: Session = Depends(get_db)):
+    return await cached_json_response("stats", {}, lambda: run_in_db(_load_stats, db))
+
+
+response_cache.register_prewarm(
+    "stats", {}, lambda: run_in_read_session(_load_stats)
+)
+
+
+def _ping_database():
+    from ..models.database import read_engine
+    from sqlalchemy import text
+
+    with read_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     try:
-        from ..models.database import engine
-
-        with engine.connect() as conn:
-            from sqlalchemy import text
-
-            conn.execute(text("SELECT 1"))
+        await run_in_db(_ping_database)
         return HealthResponse(
             status="healthy", timestamp=datetime.utcnow(), database="connected"
         )
@@ -47,8 +57,18 @@ async def health_check():
         )
 
 
-@router.get("/scrapes")
-async def get_scrapes(limit: int = 20, db: Session = Depends(get_db)):
+@router.get("/cache/stats")
+async def get_cache_stats():
+    from ..services.http_client import get_fetcher
+
+    http_cache = get_fetcher().cache
+    return {
+        "http": await http_cache.stats() if http_cache else None,
+        "responses": response_cache.stats(),
+    }
+
+
+def _load_scrapes(db: Session, limit: int):
     scrapes = (
         db.query(db_models.ScrapeLog)
         .order_by(db_models.ScrapeLog.started_at.desc())
@@ -64,9 +84,45 @@ async def get_scrapes(limit: int = 20, db: Session = Depends(get_db)):
                 "items_scraped": s.items_scraped,
                 "status": s.status,
                 "error_message": s.error_message,
+                "resumed_from_id": s.resumed_from_id,
                 "started_at": s.started_at,
                 "completed_at": s.completed_at,
             }
             for s in scrapes
         ]
     }
+
+
+def _load_checkpoints(db: Session, scrape_id: int):
+    checkpoints = (
+        db.query(db_models.ScrapeCheckpoint)
+        .filter(db_models.ScrapeCheckpoint.scrape_id == scrape_id)
+        .order_by(db_models.ScrapeCheckpoint.id)
+        .all()
+    )
+
+    return {
+        "scrape_id": scrape_id,
+        "checkpoints": [
+            {
+                "unit": c.unit,
+                "status": c.status,
+                "items": c.items,
+                "error_message": c.error_message,
+                "started_at": c.started_at,
+                "completed_at": c.completed_at,
+                "duration_ms": c.duration_ms,
+            }
+            for c in checkpoints
+        ],
+    }
+
+
+@router.get("/scrapes")
+async def get_scrapes(limit: int = 20, db: Session = Depends(get_db)):
+    return await run_in_db(_load_scrapes, db, limit)
+
+
+@router.get("/scrapes/{scrape_id}/checkpoints")
+async def get_scrape_checkpoints(scrape_id: int, db: Session = Depends(get_db)):
+    return await run_in_db(_load_checkpoints, db, scrape_id)
@@ -0,0 +1,246 @@
+import json
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from .config import settings
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis 为可选依赖
+    aioredis = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 未安装时退回标准库 json
+    orjson = None
+
+GENERATION_KEY = "skills:cache:generation"
+KEY_PREFIX = "skills:cache"
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+class ResponseCache:
+    """读 API 响应缓存：优先 Redis，不可用时退回进程内 LRU
+
+    缓存键带上代数（generation），爬虫提交后递增代数即可使旧响应全部失效。
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        lru_size: int = 512,
+        ttl_seconds: int = 86400,
+        retry_seconds: float = 30.0,
+    ):
+        self._redis_url = redis_url
+        self._redis = None
+        self._redis_retry_at = 0.0
+        self._retry_seconds = retry_seconds
+        self._ttl = ttl_seconds
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lru_size = lru_size
+        self._local_generation = 0
+        # 预热项：(名称, 参数, 加载函数)，爬取结束后重新生成
+        self._prewarm: List[Tuple[str, Dict[str, Any], Loader]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def _client(self):
+        if aioredis is None or not self._redis_url:
+            return None
+        if self._redis is None and time.monotonic() >= self._redis_retry_at:
+            self._redis = aioredis.from_url(
+                self._redis_url, socket_connect_timeout=0.2, socket_timeout=0.2
+            )
+        return self._redis
+
+    async def _disable_redis(self):
+        client, self._redis = self._redis, None
+        self._redis_retry_at = time.monotonic() + self._retry_seconds
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+    async def generation(self) -> str:
+        client = self._client()
+        if client is not None:
+            try:
+                value = await client.get(GENERATION_KEY)
+                return f"r{int(value or 0)}"
+            except Exception:
+                await self._disable_redis()
+        return f"l{self._local_generation}"
+
+    async def bump_generation(self):
+        self._local_generation += 1
+        self._lru.clear()
+        client = self._client()
+        if client is not None:
+            try:
+                await client.incr(GENERATION_KEY)
+            except Exception:
+                await self._disable_redis()
+
+    @staticmethod
+    def _key(generation: str, name: str, params: Dict[str, Any]) -> str:
+        query = urlencode(sorted((k, str(v)) for k, v in params.items()))
+        return f"{KEY_PREFIX}:{generation}:{name}?{query}"
+
+    def _remember(self, key: str, body: bytes):
+        self._lru[key] = body
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._lru_size:
+            self._lru.popitem(last=False)
+
+    async def lookup(
+        self, name: str, params: Dict[str, Any]
+    ) -> Tuple[str, Optional[bytes]]:
+        """返回当前代数下的缓存键及缓存内容；写回时使用同一个键，避免跨代写入"""
+        key = self._key(await self.generation(), name, params)
+        body = self._lru.get(key)
+        if body is not None:
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return key, body
+
+        client = self._client()
+        if client is not None:
+            try:
+                body = await client.get(key)
+            except Exception:
+                await self._disable_redis()
+            if body is not None:
+                self._remember(key, body)
+                self.hits += 1
+                return key, body
+
+        self.misses += 1
+        return key, None
+
+    async def store(self, key: str, body: bytes):
+        self._remember(key, body)
+        client = self._client()
+        if client is not None:
+            try:
+                await client.set(key, body, ex=self._ttl)
+            except Exception:
+                await self._disable_redis()
+
+    def register_prewarm(self, name: str, params: Dict[str, Any], load: Loader):
+        """登记高频请求；params 须与接口查缓存时使用的参数一致"""
+        self._prewarm.append((name, params, load))
+
+    async def prewarm(self) -> int:
+        """在当前代数下预先生成已登记请求的响应字节，返回成功条数"""
+        generation = await self.generation()
+        warmed = 0
+        for name, params, load in self._prewarm:
+            try:
+                body = dump_json(await load())
+            except Exception as e:
+                print(f"Error prewarming {name} {params}: {e}")
+                continue
+            await self.store(self._key(generation, name, params), body)
+            warmed += 1
+        return warmed
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "backend": "redis" if self._redis is not None else "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "local_entries": len(self._lru),
+            "prewarm_entries": len(self._prewarm),
+        }
+
+
+response_cache = ResponseCache(
+    settings.redis_url,
+    lru_size=settings.response_cache_lru_size,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dump_json(payload: Any) -> bytes:
+    """序列化为与 pydantic model_dump_json 相同格式的紧凑 JSON"""
+    if isinstance(payload, BaseModel):
+        return payload.model_dump_json().encode()
+    if orjson is not None:
+        # orjson 原生处理 datetime，输出与 isoformat 一致
+        return orjson.dumps(payload, default=_json_default)
+    return json.dumps(
+        payload, default=_json_default, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def json_response(body: bytes, timings: Dict[str, float]) -> Response:
+    """timings 为阶段名 -> 秒，以 Server-Timing 头返回（毫秒）"""
+    server_timing = ", ".join(
+        f"{name};dur={seconds * 1000:.2f}" for name, seconds in timings.items()
+    )
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Server-Timing": server_timing},
+    )
+
+
+async def timed_json_response(load: Loader) -> Response:
+    """不走缓存的接口同样分别计量查询与序列化耗时"""
+    started = time.perf_counter()
+    payload = await load()
+    loaded = time.perf_counter()
+    body = dump_json(payload)
+    return json_response(
+        body, {"db": loaded - started, "serialize": time.perf_counter() - loaded}
+    )
+
+
+async def cached_json_response(
+    name: str, params: Dict[str, Any], load: Loader
+) -> Response:
+    """命中缓存时直接返回已序列化的字节，否则查询并写入缓存
+
+    load 返回 pydantic 模型或由基础类型 / datetime 组成的 dict / list。
+    """
+    if not settings.response_cache_enabled:
+        return await timed_json_response(load)
+
+    started = time.perf_counter()
+    key, body = await response_cache.lookup(name, params)
+    looked_up = time.perf_counter()
+    if body is not None:
+        return json_response(body, {"cache": looked_up - started})
+
+    payload = await load()
+    loaded = time.perf_counter()
+    body = dump_json(payload)
+    serialized = time.perf_counter()
+    await response_cache.store(key, body)
+    return json_response(
+        body,
+        {
+            "cache": looked_up - started,
+            "db": loaded - looked_up,
+            "serialize": serialized - loaded,
+        },
+    )
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 import os
 
 
@@ -20,6 +20,12 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://redis:6379/0"
 
+    # Response cache
+    response_cache_enabled: bool = True
+    response_cache_lru_size: int = 512
+    response_cache_ttl_seconds: int = 86400
+    response_cache_prewarm: bool = True
+
     # CORS
     frontend_url: str = "http://localhost:3000"
 
@@ -29,9 +35,77 @@ class Settings(BaseSettings):
     pypi_scrape_interval_hours: int = 24
     huggingface_scrape_interval_minutes: int = 60
 
+    # Pagination depth per query
+    github_max_pages: int = 10
+    npm_max_pages: int = 4
+    huggingface_max_pages: int = 10
+
+    # PyPI feed mode
+    pypi_packages: List[str] = [
+        "tensorflow",
+        "torch",
+        "scikit-learn",
+        "transformers",
+        "openai",
+        "anthropic",
+        "langchain",
+        "llama-index",
+        "sentence-transformers",
+        "huggingface-hub",
+    ]
+    pypi_feed_keywords: List[str] = [
+        "llm",
+        "gpt",
+        "openai",
+        "anthropic",
+        "claude",
+        "langchain",
+        "agent",
+        "agents",
+        "rag",
+        "mcp",
+        "transformers",
+        "pytorch",
+        "tensorflow",
+        "machine learning",
+    ]
+    # pypistats 每日更新一次，未过期时不重复请求
+    pypi_stats_max_age_hours: int = 12
+
+    # Skill classifier rules (JSON file; unset rules use the built-in keywords)
+    skill_classifier_rules_path: Optional[str] = None
+
+    # Ingestion
+    ingest_batch_size: int = 500
+    ingest_flush_seconds: float = 5.0
+    ingest_queue_size: int = 1000
+    scrape_unit_concurrency: int = 4
+    scrape_resume_max_age_hours: int = 24
+
+    # Metrics retention (0 keeps weekly rollups forever)
+    metrics_raw_retention_days: int = 7
+    metrics_daily_retention_days: int = 90
+    metrics_weekly_retention_days: int = 730
+    metrics_compaction_interval_hours: int = 24
+
+    # Trending score ("hot" sort); window should stay within raw retention
+    trending_window_days: int = 3
+    trending_momentum_weight: float = 0.7
+
     # Rate Limiting
     rate_limit_per_minute: int = 60
 
+    # Outbound HTTP
+    http_timeout_seconds: float = 30.0
+    http2_enabled: bool = True
+    http_max_connections: int = 20
+    http_max_concurrency_per_host: int = 4
+    http_default_per_minute: int = 120
+    http_rate_limit_retries: int = 3
+    http_rate_limit_max_wait_seconds: float = 120.0
+    http_cache_enabled: bool = True
+    http_cache_path: Optional[str] = None
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,25 +1,34 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from datetime import datetime
 
+from .core.cache import orjson, response_cache
 from .core.config import settings
-from .models.database import init_db, get_db
+from .models.database import engine, init_db, get_db, run_in_writer
 from .api import skills, system
 from .services.github_scraper import GitHubSkillsScraper
 from .services.scheduler import ScrapingScheduler
+from .services.http_client import close_fetcher
+from .services.trending import update_trending_scores
 
 
 scheduler = ScrapingScheduler()
 
 
+def _update_all_scores():
+    with engine.begin() as conn:
+        update_trending_scores(conn)
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title="AI Skills Tracker API",
         description="API for tracking and ranking AI skills from various sources",
         version="1.0.0",
+        default_response_class=ORJSONResponse if orjson else JSONResponse,
     )
 
     app.add_middleware(
@@ -36,11 +45,16 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     async def startup_event():
         init_db()
+        # 重启期间时间窗口已移动，先按当前历史重算热度分数
+        await run_in_writer(_update_all_scores)
+        if settings.response_cache_enabled and settings.response_cache_prewarm:
+            await response_cache.prewarm()
         scheduler.start()
 
     @app.on_event("shutdown")
     async def shutdown_event():
         scheduler.stop()
+        await close_fetcher()
 
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
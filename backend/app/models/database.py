@@ -4,12 +4,19 @@ from sqlalchemy import (
     Text,
     String,
     DateTime,
+    Float,
     ForeignKey,
+    Index,
     create_engine,
+    event,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
+import asyncio
 import os
 
 Base = declarative_base()
@@ -24,12 +31,27 @@ class Skill(Base):
     description = Column(Text)
     url = Column(String(500))
     language = Column(String(50))
+    # 来源侧的变更序号（PyPI last serial），未变化时跳过元数据请求
+    source_serial = Column(Integer)
+    # 分类器标签：skill_code / tool / list / other
+    classification = Column(String(20))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     metrics = relationship(
         "SkillMetrics", back_populates="skill", cascade="all, delete-orphan"
     )
+    latest_metrics = relationship(
+        "SkillLatestMetrics",
+        back_populates="skill",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
+
+    __table_args__ = (
+        Index("ix_skills_updated_at", updated_at.desc()),
+        Index("ix_skills_source_updated_at", source, updated_at.desc()),
+    )
 
 
 class SkillMetrics(Base):
@@ -48,6 +70,84 @@ class SkillMetrics(Base):
 
     skill = relationship("Skill", back_populates="metrics")
 
+    __table_args__ = (
+        Index("ix_skill_metrics_skill_recorded", skill_id, recorded_at.desc()),
+    )
+
+
+class SkillLatestMetrics(Base):
+    """每个技能最新一次指标快照，由爬虫在同一事务内维护"""
+
+    __tablename__ = "skill_latest_metrics"
+
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    source = Column(String(50), nullable=False, index=True)
+    stars = Column(Integer, default=0)
+    forks = Column(Integer, default=0)
+    downloads_day = Column(Integer, default=0)
+    downloads_week = Column(Integer, default=0)
+    downloads_month = Column(Integer, default=0)
+    likes = Column(Integer, default=0)
+    last_activity = Column(DateTime)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
+    # 上次写入内容的哈希，用于跳过未变化的条目
+    content_hash = Column(String(32))
+    # 热度分数，每次爬取后由 services.trending 按指标历史重算
+    score = Column(Float)
+
+    skill = relationship("Skill", back_populates="latest_metrics")
+
+    # 排序索引：整数主键 skill_id 即 rowid，隐式附在每个索引末尾
+    __table_args__ = (
+        Index("ix_latest_score", score.desc()),
+        Index("ix_latest_source_score", source, score.desc()),
+        Index("ix_latest_downloads_month", downloads_month.desc()),
+        Index("ix_latest_source_downloads_month", source, downloads_month.desc()),
+    )
+
+
+class SkillCount(Base):
+    """每个来源的技能数，由爬虫在创建技能的同一事务内累加，替代逐页 COUNT(*)"""
+
+    __tablename__ = "skill_counts"
+
+    source = Column(String(50), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+
+
+class SkillMetricsDaily(Base):
+    """按天汇总的历史指标，保存每天最后一次快照"""
+
+    __tablename__ = "skill_metrics_daily"
+
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    period_start = Column(DateTime, primary_key=True)
+    stars = Column(Integer)
+    forks = Column(Integer)
+    downloads_day = Column(Integer)
+    downloads_week = Column(Integer)
+    downloads_month = Column(Integer)
+    likes = Column(Integer)
+    recorded_at = Column(DateTime)
+    samples = Column(Integer, default=0)
+
+
+class SkillMetricsWeekly(Base):
+    """按周（周一起）汇总的历史指标，保存每周最后一次快照"""
+
+    __tablename__ = "skill_metrics_weekly"
+
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+    period_start = Column(DateTime, primary_key=True)
+    stars = Column(Integer)
+    forks = Column(Integer)
+    downloads_day = Column(Integer)
+    downloads_week = Column(Integer)
+    downloads_month = Column(Integer)
+    likes = Column(Integer)
+    recorded_at = Column(DateTime)
+    samples = Column(Integer, default=0)
+
 
 class ScrapeLog(Base):
     __tablename__ = "scrapes"
@@ -59,23 +159,218 @@ class ScrapeLog(Base):
     error_message = Column(Text)
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, index=True)
+    # 续跑时指向被中断的那次爬取
+    resumed_from_id = Column(Integer, ForeignKey("scrapes.id"))
+
+    checkpoints = relationship(
+        "ScrapeCheckpoint", back_populates="scrape", cascade="all, delete-orphan"
+    )
+
+
+class ScrapeCheckpoint(Base):
+    """一次爬取中每个工作单元（查询词、分页等）的进度与耗时"""
+
+    __tablename__ = "scrape_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    scrape_id = Column(Integer, ForeignKey("scrapes.id"), nullable=False)
+    unit = Column(String(500), nullable=False)
+    status = Column(String(20), default="pending")
+    items = Column(Integer, default=0)
+    error_message = Column(Text)
+    started_at = Column(DateTime)
+    completed_at = Column(DateTime)
+    duration_ms = Column(Integer)
+
+    scrape = relationship("ScrapeLog", back_populates="checkpoints")
+
+    __table_args__ = (
+        Index("ix_scrape_checkpoints_scrape_unit", scrape_id, unit, unique=True),
+    )
 
 
 DATABASE_URL = f"sqlite:///{os.getenv('DATABASE_PATH', './skills.db')}"
 
+DB_THREAD_POOL_SIZE = int(os.getenv("DB_THREAD_POOL_SIZE", "8"))
+
+# SQLite 存储参数：WAL 下读写互不阻塞
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    # 负数表示 KiB
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+}
+
+
+def _apply_pragmas(dbapi_connection, read_only: bool):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        # journal_mode 写入文件头，只由写连接设置
+        if read_only and name == "journal_mode":
+            continue
+        cursor.execute(f"PRAGMA {name}={value}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+# 唯一的写连接，爬虫写入经 db_writer 串行执行
 engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}, echo=False
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=1,
+    max_overflow=0,
+    echo=False,
+)
+
+# API 使用的只读连接池
+read_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=DB_THREAD_POOL_SIZE,
+    max_overflow=0,
+    echo=False,
 )
 
+
+@event.listens_for(engine, "connect")
+def _on_write_connect(dbapi_connection, connection_record):
+    _apply_pragmas(dbapi_connection, read_only=False)
+
+
+@event.listens_for(read_engine, "connect")
+def _on_read_connect(dbapi_connection, connection_record):
+    _apply_pragmas(dbapi_connection, read_only=True)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# 同步 SQLAlchemy 调用统一放到专用线程池，避免阻塞事件循环
+db_executor = ThreadPoolExecutor(
+    max_workers=DB_THREAD_POOL_SIZE, thread_name_prefix="db"
+)
+
+# 单线程写队列：各来源并发爬取时写入依次排队，不会出现 database is locked
+db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+
+async def run_in_db(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(fn, *args, **kwargs))
+
+
+def _with_read_session(fn, *args, **kwargs):
+    db = ReadSessionLocal()
+    try:
+        return fn(db, *args, **kwargs)
+    finally:
+        db.close()
+
+
+async def run_in_read_session(fn, *args, **kwargs):
+    """请求之外（如缓存预热）在读线程池中用独立会话执行 fn(db, ...)"""
+    return await run_in_db(_with_read_session, fn, *args, **kwargs)
+
+
+async def run_in_writer(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_writer, partial(fn, *args, **kwargs))
+
+
+def rebuild_latest_metrics(conn):
+    """根据 skill_metrics 历史重建 skill_latest_metrics
+
+    每个技能按 recorded_at 取最新一行：相关子查询沿 ix_skill_metrics_skill_recorded
+    逐技能定位一条，不对整张历史表开窗或分组。
+    """
+    conn.execute(text("DELETE FROM skill_latest_metrics"))
+    conn.execute(
+        text(
+            """
+            INSERT INTO skill_latest_metrics (
+                skill_id, source, stars, forks, downloads_day, downloads_week,
+                downloads_month, likes, last_activity, recorded_at
+            )
+            SELECT m.skill_id, s.source, m.stars, m.forks, m.downloads_day,
+                   m.downloads_week, m.downloads_month, m.likes,
+                   m.last_activity, m.recorded_at
+            FROM skills s
+            JOIN skill_metrics m ON m.id = (
+                SELECT id FROM skill_metrics
+                WHERE skill_id = s.id
+                ORDER BY recorded_at DESC
+                LIMIT 1
+            )
+            """
+        )
+    )
+
+
+def rebuild_skill_counts(conn):
+    """根据 skills 表重建 skill_counts"""
+    conn.execute(text("DELETE FROM skill_counts"))
+    conn.execute(
+        text(
+            """
+            INSERT INTO skill_counts (source, total)
+            SELECT source, COUNT(*) FROM skills GROUP BY source
+            """
+        )
+    )
+
+
+# 不再有查询使用的索引，旧库启动时删除以免拖慢写入
+OBSOLETE_INDEXES = ("ix_latest_downloads_week", "ix_latest_source_downloads_week")
+
+
+def _add_missing_columns():
+    """create_all 不会修改已存在的表，这里为旧库补上新增的可空列"""
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {
+                row[1] for row in conn.execute(text(f"PRAGMA table_info({table.name})"))
+            }
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    )
+                )
 
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+    # create_all 不会给已存在的表补建新索引
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+    with engine.begin() as conn:
+        has_latest = conn.execute(
+            text("SELECT 1 FROM skill_latest_metrics LIMIT 1")
+        ).first()
+        if not has_latest:
+            rebuild_latest_metrics(conn)
+        has_counts = conn.execute(text("SELECT 1 FROM skill_counts LIMIT 1")).first()
+        if not has_counts:
+            rebuild_skill_counts(conn)
+        conn.execute(text("PRAGMA optimize"))
 
 
 def get_db():
-    db = SessionLocal()
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
@@ -11,6 +11,8 @@ class SkillMetrics(BaseModel):
     downloads_month: Optional[int] = None
     likes: Optional[int] = None
     last_activity: Optional[datetime] = None
+    # 来源内归一化的热度分数（0-1），"hot" 排序依据
+    score: Optional[float] = None
 
 
 class SkillBase(BaseModel):
@@ -31,6 +33,7 @@ class SkillUpdate(SkillBase):
 
 class Skill(SkillBase):
     id: int
+    classification: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     metrics: Optional[SkillMetrics] = None
@@ -81,6 +84,8 @@ class SkillsResponse(BaseModel):
     total: int
     sort_by: str
     updated_at: datetime
+    # 传回 cursor 参数获取下一页；为空表示已到末尾
+    next_cursor: Optional[str] = None
 
 
 class StatsResponse(BaseModel):
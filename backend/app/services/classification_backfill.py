@@ -0,0 +1,98 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.engine import Engine
+
+from ..models.database import Skill
+from .skill_classifier import SkillClassifier, load_rules, skill_label
+from ..core.config import settings
+
+# 旧版本在描述前加的标记，回填时一并去掉
+LEGACY_PREFIX = "[Skill Code] "
+
+Row = Tuple[int, str, Optional[str], Optional[str]]
+
+_UPDATE_SKILLS = (
+    Skill.__table__.update()
+    .where(Skill.id == bindparam("b_id"))
+    .values(
+        classification=bindparam("classification"),
+        description=bindparam("description"),
+    )
+)
+
+_worker_classifier: Optional[SkillClassifier] = None
+
+
+def _init_worker(rules: Dict[str, List[str]]):
+    global _worker_classifier
+    _worker_classifier = SkillClassifier(rules)
+
+
+def _classify_chunk(rows: List[Row]) -> List[Dict[str, object]]:
+    """返回分类或描述需要变化的行"""
+    updates = []
+    for skill_id, name, description, classification in rows:
+        cleaned = description
+        if cleaned and cleaned.startswith(LEGACY_PREFIX):
+            cleaned = cleaned[len(LEGACY_PREFIX) :]
+        label = skill_label(_worker_classifier, name, cleaned)
+        if label != classification or cleaned != description:
+            updates.append(
+                {"b_id": skill_id, "classification": label, "description": cleaned}
+            )
+    return updates
+
+
+def _iter_chunks(read_engine: Engine, chunk_size: int) -> Iterator[List[Row]]:
+    stmt = select(Skill.id, Skill.name, Skill.description, Skill.classification)
+    with read_engine.connect() as conn:
+        # yield_per 逐块从游标取行，不把整表读入内存
+        result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+def backfill_classifications(
+    write_engine: Engine,
+    read_engine: Engine,
+    chunk_size: int = 5000,
+    workers: int = 1,
+) -> Dict[str, int]:
+    """按当前规则重新分类全部技能，只写回变化的行
+
+    分类每行只需几微秒，默认在本进程内完成；多进程的序列化开销通常超过分类本身。
+    写入后缓存的 API 响应不会自动失效，调用方需递增 response_cache 的代数。
+    """
+    rules = load_rules(settings.skill_classifier_rules_path)
+    totals = {"skills_scanned": 0, "skills_updated": 0}
+
+    def apply(size: int, updates: List[Dict[str, object]]):
+        if updates:
+            with write_engine.begin() as conn:
+                conn.execute(_UPDATE_SKILLS, updates)
+        totals["skills_scanned"] += size
+        totals["skills_updated"] += len(updates)
+
+    if workers <= 1:
+        _init_worker(rules)
+        for chunk in _iter_chunks(read_engine, chunk_size):
+            apply(len(chunk), _classify_chunk(chunk))
+        return totals
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(rules,)
+    ) as pool:
+        # 限制在途块数，读取、分类与写入流水线进行
+        pending: Deque[Tuple[int, Future]] = deque()
+        for chunk in _iter_chunks(read_engine, chunk_size):
+            pending.append((len(chunk), pool.submit(_classify_chunk, chunk)))
+            if len(pending) >= workers * 2:
+                size, future = pending.popleft()
+                apply(size, future.result())
+        for size, future in pending:
+            apply(size, future.result())
+
+    return totals
@@ -1,5 +1,5 @@
-import httpx
-from typing import List, Dict, Any, Optional
+import math
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
 
 from .scraper_base import BaseScraper
@@ -10,51 +10,76 @@ class GitHubSkillsScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "github"
 
-    async def scrape(self) -> List[Dict[str, Any]]:
-        base_url = "https://api.github.com/search/repositories"
+    BASE_URL = "https://api.github.com/search/repositories"
+    PER_PAGE = 100
+    # 搜索 API 最多返回前 1000 条
+    SEARCH_RESULT_LIMIT = 1000
+    QUERIES = [
+        ("awesome-openai+language:python", "stars"),
+        ("awesome-chatgpt+language:python", "stars"),
+        ("awesome-langchain+language:python", "stars"),
+        ("awesome-llm+language:python", "stars"),
+        ("awesome-anthropic+language:python", "stars"),
+        ("openai-examples+language:python", "stars"),
+        ("chatgpt-examples+language:python", "stars"),
+        ("langchain-examples+language:python", "stars"),
+        ("claude-examples+language:python", "stars"),
+        ("cohere-examples+language:python", "stars"),
+        ("codex+language:python", "stars"),
+        ("openclaw+language:python", "stars"),
+        ("clawdbot+language:python", "stars"),
+        ("opencode+language:python", "stars"),
+        ("rag-implementation+language:python", "stars"),
+        ("rag-example+language:python", "stars"),
+        ("agent-framework+language:python", "stars"),
+        ("autonomous-agent+language:python", "stars"),
+        ("function-calling+language:python", "stars"),
+        ("prompt-engineering+language:python", "stars"),
+        ("fine-tuning-examples+language:python", "stars"),
+        ("api-integration-example+language:python", "stars"),
+        ("streaming-implementation+language:python", "stars"),
+    ]
+
+    def _headers(self) -> Dict[str, str]:
         headers = {}
         if settings.github_token:
             headers["Authorization"] = f"Bearer {settings.github_token}"
+        return headers
 
-        results = []
-        queries = [
-            ("awesome-openai+language:python", "stars"),
-            ("awesome-chatgpt+language:python", "stars"),
-            ("awesome-langchain+language:python", "stars"),
-            ("awesome-llm+language:python", "stars"),
-            ("awesome-anthropic+language:python", "stars"),
-            ("openai-examples+language:python", "stars"),
-            ("chatgpt-examples+language:python", "stars"),
-            ("langchain-examples+language:python", "stars"),
-            ("claude-examples+language:python", "stars"),
-            ("cohere-examples+language:python", "stars"),
-            ("codex+language:python", "stars"),
-            ("openclaw+language:python", "stars"),
-            ("clawdbot+language:python", "stars"),
-            ("opencode+language:python", "stars"),
-            ("rag-implementation+language:python", "stars"),
-            ("rag-example+language:python", "stars"),
-            ("agent-framework+language:python", "stars"),
-            ("autonomous-agent+language:python", "stars"),
-            ("function-calling+language:python", "stars"),
-            ("prompt-engineering+language:python", "stars"),
-            ("fine-tuning-examples+language:python", "stars"),
-            ("api-integration-example+language:python", "stars"),
-            ("streaming-implementation+language:python", "stars"),
-        ]
+    async def _search(
+        self, query: str, sort_by: str, page: int = 1
+    ) -> Dict[str, Any]:
+        params = {
+            "q": query,
+            "sort": sort_by,
+            "order": "desc",
+            "per_page": self.PER_PAGE,
+            "page": page,
+        }
+        return await self.http.get_json(
+            self.BASE_URL, params=params, headers=self._headers()
+        )
 
-        async with httpx.AsyncClient() as client:
-            for query, sort_by in queries:
-                params = {"q": query, "sort": sort_by, "order": "desc", "per_page": 50}
+    async def _search_page(
+        self, query: str, sort_by: str, page: int
+    ) -> List[Dict[str, Any]]:
+        data = await self._search(query, sort_by, page)
+        return [self._parse_repo(item) for item in data.get("items", [])]
 
-                response = await client.get(base_url, headers=headers, params=params)
-                response.raise_for_status()
-                data = response.json()
+    def work_units(self) -> List[str]:
+        return [query for query, _ in self.QUERIES]
 
-                for item in data.get("items", []):
-                    results.append(self._parse_repo(item))
+    async def stream_unit(self, unit: str) -> AsyncIterator[Dict[str, Any]]:
+        sort_by = dict(self.QUERIES)[unit]
+        data = await self._search(unit, sort_by)
+        total = min(data.get("total_count", 0), self.SEARCH_RESULT_LIMIT)
+        pages = min(settings.github_max_pages, math.ceil(total / self.PER_PAGE))
 
-        return results[:100]
+        first_page = [self._parse_repo(item) for item in data.get("items", [])]
+        async for item in self._paginate(
+            first_page, lambda page: self._search_page(unit, sort_by, page), pages
+        ):
+            yield item
 
     def _parse_repo(self, repo: Dict[str, Any]) -> Dict[str, Any]:
         return {
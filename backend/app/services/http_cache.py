@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from ..core.config import settings
+
+
+@dataclass
+class CachedResponse:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+
+
+def default_cache_path() -> str:
+    if settings.http_cache_path:
+        return settings.http_cache_path
+    database_path = os.getenv("DATABASE_PATH", "./skills.db")
+    return os.path.join(os.path.dirname(database_path) or ".", "http_cache.db")
+
+
+class HttpCache:
+    """按 URL + 参数持久化 ETag / Last-Modified 及响应体，用于条件请求
+
+    SQLite 读写都在专用单线程中执行，不阻塞事件循环；单线程也保证连接串行使用。
+    """
+
+    def __init__(self, path: str, memory_entries: int = 256):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                stored_at TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="http-cache"
+        )
+        # 已解析的 JSON，304 时直接复用，避免重复解析
+        self._decoded: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        query = urlencode(sorted((params or {}).items()), doseq=True)
+        return hashlib.sha256(f"{url}?{query}".encode()).hexdigest()
+
+    async def _in_thread(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args))
+
+    def _select(self, key: str) -> Optional[CachedResponse]:
+        row = self._conn.execute(
+            "SELECT etag, last_modified, body FROM http_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    async def lookup(self, key: str) -> Optional[CachedResponse]:
+        return await self._in_thread(self._select, key)
+
+    def conditional_headers(self, cached: Optional[CachedResponse]) -> Dict[str, str]:
+        headers = {}
+        if cached and cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached and cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    def _upsert(
+        self,
+        key: str,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body: bytes,
+    ):
+        self._conn.execute(
+            """
+            INSERT INTO http_cache (key, url, etag, last_modified, body, stored_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                body = excluded.body,
+                stored_at = excluded.stored_at
+            """,
+            (key, url, etag, last_modified, body, datetime.utcnow().isoformat()),
+        )
+        self._conn.commit()
+
+    async def store(
+        self,
+        key: str,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        body: bytes,
+        data: Any = None,
+    ):
+        # 内存中的解析结果只在事件循环中修改
+        self._decoded.pop(key, None)
+        if data is not None:
+            self._remember(key, data)
+        await self._in_thread(self._upsert, key, url, etag, last_modified, body)
+
+    def decoded(self, key: str, cached: CachedResponse) -> Any:
+        data = self._decoded.get(key)
+        if data is None:
+            data = json.loads(cached.body)
+            self._remember(key, data)
+        else:
+            self._decoded.move_to_end(key)
+        return data
+
+    def _remember(self, key: str, data: Any):
+        self._decoded[key] = data
+        while len(self._decoded) > self._memory_entries:
+            self._decoded.popitem(last=False)
+
+    def record_hit(self):
+        self.hits += 1
+
+    def record_miss(self):
+        self.misses += 1
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0]
+
+    async def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "entries": await self._in_thread(self._count),
+        }
+
+    def close(self):
+        # 等待已提交的写入完成后再关闭连接
+        self._executor.shutdown(wait=True)
+        self._conn.close()
@@ -0,0 +1,334 @@
+import asyncio
+import importlib.util
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..core.config import settings
+from .http_cache import HttpCache, default_cache_path
+
+
+@dataclass(frozen=True)
+class HostLimit:
+    concurrency: int
+    per_minute: int
+    burst: int = 1
+
+
+# 各数据源的公开限速，留出余量
+HOST_LIMITS: Dict[str, HostLimit] = {
+    "api.github.com": HostLimit(concurrency=2, per_minute=30, burst=30),
+    "registry.npmjs.org": HostLimit(concurrency=8, per_minute=600, burst=20),
+    "api.npmjs.org": HostLimit(concurrency=4, per_minute=300, burst=10),
+    "pypi.org": HostLimit(concurrency=8, per_minute=600, burst=20),
+    "pypistats.org": HostLimit(concurrency=2, per_minute=60),
+    "huggingface.co": HostLimit(concurrency=4, per_minute=300, burst=10),
+}
+
+RATE_LIMIT_STATUS_CODES = (403, 429)
+
+
+class TokenBucket:
+    """令牌桶：按 per_minute 匀速补充，可根据服务端限速头暂停到指定时间"""
+
+    def __init__(self, per_minute: int, capacity: int = 1):
+        self._rate = per_minute / 60.0
+        self._capacity = max(capacity, 1)
+        self._tokens = float(self._capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._refill_on_resume = False
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if self._refill_on_resume:
+                    # 限速窗口已重置，配额回满
+                    self._tokens = float(self._capacity)
+                    self._updated = now
+                    self._refill_on_resume = False
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    def pause_until(self, deadline: float, window_reset: bool = False):
+        self._paused_until = max(self._paused_until, deadline)
+        self._refill_on_resume = self._refill_on_resume or window_reset
+
+    def limit_remaining(self, remaining: int):
+        self._refill(time.monotonic())
+        self._tokens = min(self._tokens, float(remaining))
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+def rate_limit_delay(response: httpx.Response) -> Tuple[Optional[float], bool]:
+    """根据 Retry-After / X-RateLimit-* 计算需要等待的秒数及等待后窗口是否重置"""
+    headers = response.headers
+    retry_after = _retry_after_seconds(headers.get("retry-after"))
+    if retry_after is not None:
+        return retry_after, False
+
+    remaining = headers.get("x-ratelimit-remaining")
+    reset = headers.get("x-ratelimit-reset")
+    if remaining == "0" and reset and reset.isdigit():
+        return max(int(reset) - time.time(), 0.0) + 1.0, True
+
+    if response.status_code == 429:
+        return 60.0, False
+    return None, False
+
+
+class _HostThrottle:
+    """单个 host 的并发上限与令牌桶"""
+
+    def __init__(self, limit: HostLimit):
+        self._semaphore = asyncio.Semaphore(limit.concurrency)
+        self.bucket = TokenBucket(limit.per_minute, limit.burst)
+
+    def observe(self, response: httpx.Response) -> Optional[float]:
+        remaining = response.headers.get("x-ratelimit-remaining")
+        if remaining and remaining.isdigit():
+            self.bucket.limit_remaining(int(remaining))
+
+        delay, window_reset = rate_limit_delay(response)
+        if delay is not None:
+            self.bucket.pause_until(time.monotonic() + delay, window_reset)
+        return delay
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            await self.bucket.acquire()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+
+class HttpFetcher:
+    """所有爬虫共用的长连接 HTTP 客户端，按 host 限制并发与速率"""
+
+    def __init__(
+        self,
+        timeout: float = settings.http_timeout_seconds,
+        http2: bool = settings.http2_enabled,
+        max_connections: int = settings.http_max_connections,
+        host_limits: Optional[Dict[str, HostLimit]] = None,
+        cache: Optional[HttpCache] = None,
+    ):
+        self._timeout = timeout
+        # 未安装 h2 时退回 HTTP/1.1 keep-alive
+        self._http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._max_connections = max_connections
+        self._host_limits = host_limits if host_limits is not None else HOST_LIMITS
+        self._throttles: Dict[str, _HostThrottle] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self.cache = cache
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self._http2,
+                timeout=self._timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+            )
+        return self._client
+
+    def _throttle(self, host: str) -> _HostThrottle:
+        throttle = self._throttles.get(host)
+        if throttle is None:
+            limit = self._host_limits.get(
+                host,
+                HostLimit(
+                    concurrency=settings.http_max_concurrency_per_host,
+                    per_minute=settings.http_default_per_minute,
+                ),
+            )
+            throttle = self._throttles[host] = _HostThrottle(limit)
+        return throttle
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        throttle = self._throttle(urlsplit(url).hostname or "")
+        for _ in range(settings.http_rate_limit_retries + 1):
+            async with throttle:
+                response = await self.client.request(
+                    method, url, params=params, headers=headers
+                )
+
+            delay = throttle.observe(response)
+            if (
+                response.status_code not in RATE_LIMIT_STATUS_CODES
+                or delay is None
+                or delay > settings.http_rate_limit_max_wait_seconds
+            ):
+                return response
+            # 令牌桶已暂停到重置时间，下一轮 acquire 会自动等待
+        return response
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        return await self.request("GET", url, params=params, headers=headers)
+
+    async def head(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        return await self.request("HEAD", url, params=params, headers=headers)
+
+    async def _fetch_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Any, httpx.Response]:
+        if self.cache is None:
+            response = await self.get(url, params=params, headers=headers)
+            response.raise_for_status()
+            return response.json(), response
+
+        key = self.cache.key(url, params)
+        cached = await self.cache.lookup(key)
+        request_headers = {**(headers or {}), **self.cache.conditional_headers(cached)}
+
+        response = await self.get(url, params=params, headers=request_headers)
+        if response.status_code == 304 and cached is not None:
+            self.cache.record_hit()
+            return self.cache.decoded(key, cached), response
+
+        response.raise_for_status()
+        self.cache.record_miss()
+        data = response.json()
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if etag or last_modified:
+            await self.cache.store(
+                key, url, etag, last_modified, response.content, data
+            )
+        return data, response
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        data, _ = await self._fetch_json(url, params=params, headers=headers)
+        return data
+
+    async def get_json_page(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[Any, Optional[str]]:
+        """返回 (数据, 下一页 URL)，下一页取自 Link: rel="next" 游标"""
+        data, response = await self._fetch_json(url, params=params, headers=headers)
+        return data, response.links.get("next", {}).get("url")
+
+    async def gather(
+        self, tasks: Iterable[Awaitable[Any]], return_exceptions: bool = False
+    ) -> List[Any]:
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    async def iter_completed(
+        self, tasks: Dict[Any, Awaitable[Any]]
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        """按完成顺序产出 (key, 结果或异常)；调用方提前退出时取消未完成的任务"""
+        pending = {asyncio.ensure_future(task): key for key, task in tasks.items()}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    key = pending.pop(future)
+                    yield key, future.exception() or future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        self._throttles.clear()
+
+
+_fetcher: Optional[HttpFetcher] = None
+
+
+def get_fetcher() -> HttpFetcher:
+    global _fetcher
+    if _fetcher is None:
+        cache = HttpCache(default_cache_path()) if settings.http_cache_enabled else None
+        _fetcher = HttpFetcher(cache=cache)
+    return _fetcher
+
+
+async def close_fetcher():
+    global _fetcher
+    if _fetcher is not None:
+        await _fetcher.aclose()
+        _fetcher = None
@@ -1,33 +1,33 @@
-import httpx
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
 
 from .scraper_base import BaseScraper
+from ..core.config import settings
 
 
 class HuggingFaceScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "huggingface"
 
-    async def scrape(self) -> List[Dict[str, Any]]:
-        results = []
-        base_url = "https://huggingface.co/api/models"
-
-        queries = [
-            {"sort": "downloads", "direction": -1, "limit": 50},
-            {"sort": "likes", "direction": -1, "limit": 30},
-        ]
-
-        async with httpx.AsyncClient() as client:
-            for params in queries:
-                response = await client.get(base_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                for model in data:
-                    results.append(self._parse_model(model))
-
-        return results[:60]
+    BASE_URL = "https://huggingface.co/api/models"
+    PAGE_SIZE = 100
+    SORTS = ["downloads", "likes"]
+
+    def work_units(self) -> List[str]:
+        return list(self.SORTS)
+
+    async def stream_unit(self, unit: str) -> AsyncIterator[Dict[str, Any]]:
+        # 列表接口只提供 Link 游标，逐页跟随
+        url = self.BASE_URL
+        params = {"sort": unit, "direction": -1, "limit": self.PAGE_SIZE}
+        for _ in range(settings.huggingface_max_pages):
+            models, url = await self.http.get_json_page(url, params=params)
+            for model in models:
+                yield self._parse_model(model)
+            if not url or not models:
+                break
+            # 游标 URL 已带上全部查询参数
+            params = None
 
     def _parse_model(self, model: Dict[str, Any]) -> Dict[str, Any]:
         model_id = model.get("modelId", "")
@@ -1,53 +1,124 @@
-import httpx
-from typing import List, Dict, Any, Optional
+import asyncio
+import math
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
 from .scraper_base import BaseScraper
+from ..core.config import settings
 
 
 class NpmScraper(BaseScraper):
     def get_source_name(self) -> str:
         return "npm"
 
-    async def scrape(self) -> List[Dict[str, Any]]:
-        results = []
-        queries = ["ai", "machine-learning", "tensorflow", "openai", "langchain"]
-
-        async with httpx.AsyncClient() as client:
-            for query in queries:
-                search_url = f"https://registry.npmjs.org/-/v1/search"
-                params = {
-                    "text": query,
-                    "size": 20,
-                    "popularity": 1.0,
-                    "quality": 0.5,
-                    "maintenance": 1.0,
-                }
-
-                response = await client.get(search_url, params=params)
-                response.raise_for_status()
-                data = response.json()
-
-                for item in data.get("objects", []):
-                    package = item.get("package", {})
-                    results.append(await self._parse_package(client, package))
-
-        return results[:50]
-
-    async def _parse_package(
-        self, client: httpx.AsyncClient, package: Dict[str, Any]
+    SEARCH_URL = "https://registry.npmjs.org/-/v1/search"
+    PAGE_SIZE = 250
+    QUERIES = ["ai", "machine-learning", "tensorflow", "openai", "langchain"]
+    DOWNLOADS_URL = "https://api.npmjs.org/downloads/range/last-month"
+    # 批量接口一次最多 128 个包
+    BULK_CHUNK_SIZE = 128
+    SCOPED_CONCURRENCY = 4
+
+    async def _search(self, query: str, page: int = 1) -> Dict[str, Any]:
+        params = {
+            "text": query,
+            "size": self.PAGE_SIZE,
+            "from": (page - 1) * self.PAGE_SIZE,
+            "popularity": 1.0,
+            "quality": 0.5,
+            "maintenance": 1.0,
+        }
+        return await self.http.get_json(self.SEARCH_URL, params=params)
+
+    async def _parse_page(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        packages = [item.get("package", {}) for item in data.get("objects", [])]
+        # 其他查询已取过下载量的包只产出搜索字段，由去重阶段合并
+        claimed = [
+            package["name"]
+            for package in packages
+            if self.claim(package.get("name", ""))
+        ]
+        downloads = await self._fetch_downloads(claimed)
+        return [
+            self._parse_package(package, downloads.get(package.get("name", "")))
+            for package in packages
+        ]
+
+    async def _search_page(self, query: str, page: int) -> List[Dict[str, Any]]:
+        return await self._parse_page(await self._search(query, page))
+
+    async def _fetch_downloads(self, names: List[str]) -> Dict[str, Dict[str, int]]:
+        """最近 30 天按日下载量一次取回日 / 周 / 月三个统计
+
+        非 scoped 包按逗号批量查询；scoped 包不支持批量，逐个查询并限制并发。
+        """
+        unscoped = [name for name in names if not name.startswith("@")]
+        chunks = [
+            unscoped[i : i + self.BULK_CHUNK_SIZE]
+            for i in range(0, len(unscoped), self.BULK_CHUNK_SIZE)
+        ]
+        # 只有一个包名时接口返回该包本身而不是 {name: ...}，与 scoped 包一样单独查询
+        singles = [name for name in names if name.startswith("@")]
+        singles += [chunk[0] for chunk in chunks if len(chunk) == 1]
+        chunks = [chunk for chunk in chunks if len(chunk) > 1]
+
+        semaphore = asyncio.Semaphore(self.SCOPED_CONCURRENCY)
+
+        async def fetch_single(name: str) -> Dict[str, Any]:
+            async with semaphore:
+                return {name: await self.http.get_json(f"{self.DOWNLOADS_URL}/{name}")}
+
+        results = await self.http.gather(
+            [
+                *(
+                    self.http.get_json(f"{self.DOWNLOADS_URL}/{','.join(chunk)}")
+                    for chunk in chunks
+                ),
+                *(fetch_single(name) for name in singles),
+            ],
+            return_exceptions=True,
+        )
+
+        downloads = {}
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Error fetching npm downloads: {result}")
+                continue
+            for name, data in result.items():
+                if data:
+                    downloads[name] = self._summarize_downloads(data)
+        return downloads
+
+    @staticmethod
+    def _summarize_downloads(data: Dict[str, Any]) -> Dict[str, int]:
+        daily = [day.get("downloads", 0) for day in data.get("downloads", [])]
+        return {
+            "downloads_day": daily[-1] if daily else 0,
+            "downloads_week": sum(daily[-7:]),
+            "downloads_month": sum(daily),
+        }
+
+    def work_units(self) -> List[str]:
+        return list(self.QUERIES)
+
+    async def stream_unit(self, unit: str) -> AsyncIterator[Dict[str, Any]]:
+        data = await self._search(unit)
+        total = data.get("total", 0)
+        pages = min(settings.npm_max_pages, math.ceil(total / self.PAGE_SIZE))
+
+        async for item in self._paginate(
+            await self._parse_page(data),
+            lambda page: self._search_page(unit, page),
+            pages,
+        ):
+            yield item
+
+    def _parse_package(
+        self, package: Dict[str, Any], downloads: Optional[Dict[str, int]]
     ) -> Dict[str, Any]:
         name = package.get("name", "")
         description = package.get("description", "")
-
-        downloads_url = f"https://api.npmjs.org/downloads/point/last-week/{name}"
-        downloads_data = {"downloads": 0}
-        try:
-            response = await client.get(downloads_url)
-            response.raise_for_status()
-            downloads_data = response.json()
-        except Exception:
-            pass
+        downloads = downloads or {}
 
         return {
             "name": name,
@@ -56,9 +127,9 @@ class NpmScraper(BaseScraper):
             "language": "JavaScript",
             "stars": None,
             "forks": None,
-            "downloads_day": None,
-            "downloads_week": downloads_data.get("downloads", 0),
-            "downloads_month": None,
+            "downloads_day": downloads.get("downloads_day"),
+            "downloads_week": downloads.get("downloads_week"),
+            "downloads_month": downloads.get("downloads_month"),
             "likes": None,
             "last_activity": self._parse_datetime(
                 package.get("date", {}).get("modified")
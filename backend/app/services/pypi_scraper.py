@@ -1,73 +1,198 @@
-import httpx
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import asyncio
+import re
+import xml.etree.ElementTree as ET
+from typing import AsyncIterator, List, Dict, Any, Optional
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+from sqlalchemy.orm import Session
 
 from .scraper_base import BaseScraper
+from ..core.config import settings
+from ..models.database import Skill, SkillLatestMetrics, run_in_writer
 
 
 class PyPIScraper(BaseScraper):
+    """由 RSS 更新源和已跟踪包驱动的增量爬虫
+
+    已跟踪的包先用 HEAD 读取 X-PyPI-Last-Serial，序号未变时复用已存字段，
+    只在下载统计过期时刷新 pypistats。
+    """
+
+    def __init__(self, db: Session):
+        super().__init__(db)
+        # 已跟踪的包每次运行只读取一次，各工作单元共用
+        self._tracked: Optional["asyncio.Future[Dict[str, Dict[str, Any]]]"] = None
+
     def get_source_name(self) -> str:
         return "pypi"
 
-    async def scrape(self) -> List[Dict[str, Any]]:
-        results = []
-        queries = ["tensorflow", "pytorch", "scikit-learn", "transformers", "openai"]
-
-        async with httpx.AsyncClient() as client:
-            for query in queries:
-                search_url = f"https://pypi.org/search/"
-                params = {"q": query}
-
-                response = await client.get(search_url, params=params)
-                if response.status_code == 200:
-                    package_names = self._extract_package_names(response.text)
-                    for name in package_names[:10]:
-                        try:
-                            package_data = await self._fetch_package_data(client, name)
-                            if package_data:
-                                results.append(package_data)
-                        except Exception as e:
-                            print(f"Error fetching {name}: {e}")
-
-        return results[:50]
-
-    def _extract_package_names(self, html: str) -> List[str]:
-        names = []
-        for line in html.split("\n"):
-            if '<a class="package-snippet"' in line:
-                start = line.find('href="/project/')
-                if start != -1:
-                    start += 15
-                    end = line.find("/", start)
-                    if end != -1:
-                        names.append(line[start:end])
-        return names
+    FEEDS = [
+        "https://pypi.org/rss/updates.xml",
+        "https://pypi.org/rss/packages.xml",
+    ]
+    SIMPLE_URL = "https://pypi.org/simple"
+    RELEASES_FEED_URL = "https://pypi.org/rss/project/{name}/releases.xml"
 
-    async def _fetch_package_data(
-        self, client: httpx.AsyncClient, name: str
+    def canonical_name(self, name: str) -> str:
+        # PEP 503 规范化名称
+        return re.sub(r"[-_.]+", "-", name).lower()
+
+    def work_units(self) -> List[str]:
+        return ["feeds", "tracked"]
+
+    async def stream_unit(self, unit: str) -> AsyncIterator[Dict[str, Any]]:
+        tracked = await self._get_tracked()
+        if unit == "feeds":
+            # 源中出现的已跟踪包同样先比较序号
+            versions = await self._feed_candidates()
+        else:
+            versions = dict.fromkeys(tracked)
+
+        tasks = {
+            name: self._refresh(
+                tracked[name]["name"] if tracked.get(name) else name,
+                tracked.get(name),
+                version,
+            )
+            for name, version in versions.items()
+            if self.claim(name)
+        }
+        async for name, item in self.http.iter_completed(tasks):
+            if isinstance(item, Exception):
+                print(f"Error fetching {name}: {item}")
+            elif item:
+                yield item
+
+    async def _feed_candidates(self) -> Dict[str, Optional[str]]:
+        """RSS 更新 / 新包源中名称或简介命中关键词的包及其版本"""
+        keywords = re.compile(
+            r"\b(?:%s)\b" % "|".join(map(re.escape, settings.pypi_feed_keywords)),
+            re.IGNORECASE,
+        )
+        feeds = await self.http.gather(
+            [self.http.get(url) for url in self.FEEDS], return_exceptions=True
+        )
+
+        candidates = {}
+        for url, response in zip(self.FEEDS, feeds):
+            if isinstance(response, Exception) or response.status_code != 200:
+                print(f"Error fetching {url}: {response}")
+                continue
+            for entry in ET.fromstring(response.content).iter("item"):
+                # 链接形如 https://pypi.org/project/<name>/[<version>/]
+                parts = urlsplit(entry.findtext("link") or "").path.split("/")
+                if len(parts) < 3 or parts[1] != "project":
+                    continue
+                name = self.canonical_name(parts[2])
+                summary = entry.findtext("description") or ""
+                if keywords.search(f"{name.replace('-', ' ')} {summary}"):
+                    version = parts[3] if len(parts) > 3 and parts[3] else None
+                    candidates[name] = candidates.get(name) or version
+        return candidates
+
+    async def _get_tracked(self) -> Dict[str, Dict[str, Any]]:
+        if self._tracked is None:
+            self._tracked = asyncio.ensure_future(run_in_writer(self._load_tracked))
+        return await asyncio.shield(self._tracked)
+
+    def _load_tracked(self) -> Dict[str, Dict[str, Any]]:
+        """配置的种子包加上库中已有的 PyPI 技能，按规范化名称索引上次写入的字段"""
+        try:
+            rows = (
+                self.db.query(
+                    Skill.name,
+                    Skill.description,
+                    Skill.url,
+                    Skill.source_serial,
+                    SkillLatestMetrics.last_activity,
+                    SkillLatestMetrics.recorded_at,
+                )
+                .outerjoin(SkillLatestMetrics, SkillLatestMetrics.skill_id == Skill.id)
+                .filter(Skill.source == self.get_source_name())
+                .all()
+            )
+        finally:
+            # 结束只读事务，释放唯一的写连接，HTTP 阶段不占用它
+            self.db.rollback()
+        tracked = {self.canonical_name(name): None for name in settings.pypi_packages}
+        tracked.update((self.canonical_name(row.name), row._asdict()) for row in rows)
+        return tracked
+
+    async def _last_serial(self, name: str) -> Optional[int]:
+        response = await self.http.head(f"{self.SIMPLE_URL}/{name}/")
+        serial = response.headers.get("x-pypi-last-serial")
+        return int(serial) if response.status_code == 200 and serial else None
+
+    async def _refresh(
+        self,
+        name: str,
+        stored: Optional[Dict[str, Any]],
+        version: Optional[str] = None,
     ) -> Optional[Dict[str, Any]]:
-        metadata_url = f"https://pypi.org/pypi/{name}/json"
-        stats_url = f"https://pypistats.org/api/packages/{name}/recent"
+        if stored is None:
+            return await self._fetch_package_data(name, version)
 
-        metadata_response = await client.get(metadata_url)
-        metadata_response.raise_for_status()
-        metadata = metadata_response.json()
+        serial = await self._last_serial(name)
+        if serial is None or serial != stored["source_serial"]:
+            return await self._fetch_package_data(name, version)
 
-        info = metadata.get("info", {})
-        releases = metadata.get("releases", {})
-        latest_release = max(
-            releases.items(),
-            key=lambda x: x[1][0]["upload_time"] if x[1] else "",
-            default=(None, []),
+        # 元数据未变化：统计仍新鲜时整体跳过，否则只刷新下载量
+        fresh_after = datetime.utcnow() - timedelta(
+            hours=settings.pypi_stats_max_age_hours
         )
+        if stored["recorded_at"] and stored["recorded_at"] >= fresh_after:
+            return None
+        stats = (await self._fetch_stats(name)).get("data", {})
+        return {
+            "name": name,
+            "description": stored["description"],
+            "url": stored["url"],
+            "language": "Python",
+            "stars": None,
+            "forks": None,
+            "downloads_day": stats.get("last_day", 0),
+            "downloads_week": stats.get("last_week", 0),
+            "downloads_month": stats.get("last_month", 0),
+            "likes": None,
+            "last_activity": stored["last_activity"],
+            "source_serial": serial,
+        }
 
-        downloads_data = {"data": {"last_day": 0, "last_week": 0, "last_month": 0}}
+    async def _fetch_stats(self, name: str) -> Dict[str, Any]:
+        stats_url = f"https://pypistats.org/api/packages/{name}/recent"
         try:
-            stats_response = await client.get(stats_url)
-            stats_response.raise_for_status()
-            downloads_data = stats_response.json()
+            return await self.http.get_json(stats_url)
         except Exception:
-            pass
+            return {"data": {"last_day": 0, "last_week": 0, "last_month": 0}}
+
+    async def _latest_version(self, name: str) -> Optional[str]:
+        """项目发布 RSS 按时间倒序，第一条即最近上传的版本"""
+        response = await self.http.get(self.RELEASES_FEED_URL.format(name=name))
+        if response.status_code != 200:
+            return None
+        return ET.fromstring(response.content).findtext("channel/item/title")
+
+    async def _fetch_metadata(
+        self, name: str, version: Optional[str]
+    ) -> Dict[str, Any]:
+        # 按版本查询的接口不含完整 releases，大型包的响应小几个数量级
+        version = version or await self._latest_version(name)
+        path = f"{name}/{version}" if version else name
+        return await self.http.get_json(f"https://pypi.org/pypi/{path}/json")
+
+    async def _fetch_package_data(
+        self, name: str, version: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        metadata, downloads_data = await self.http.gather(
+            [self._fetch_metadata(name, version), self._fetch_stats(name)]
+        )
+
+        info = metadata.get("info", {})
+        # urls 为该版本的发行文件，最晚的上传时间即最近活动时间
+        latest_upload = max(
+            (file["upload_time"] for file in metadata.get("urls", [])), default=None
+        )
 
         stats = downloads_data.get("data", {})
 
@@ -82,9 +207,8 @@ class PyPIScraper(BaseScraper):
             "downloads_week": stats.get("last_week", 0),
             "downloads_month": stats.get("last_month", 0),
             "likes": None,
-            "last_activity": self._parse_datetime(
-                latest_release[1][0]["upload_time"] if latest_release[1] else None
-            ),
+            "last_activity": self._parse_datetime(latest_upload),
+            "source_serial": metadata.get("last_serial"),
         }
 
     def _parse_datetime(self, date_str: Optional[str]) -> Optional[datetime]:
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+
+METRIC_COLUMNS = (
+    "stars",
+    "forks",
+    "downloads_day",
+    "downloads_week",
+    "downloads_month",
+    "likes",
+)
+
+# SQLite 中 MAX() 聚合时，其余裸列取自 recorded_at 最大的那一行，即周期内最后一次快照
+_ROLLUP_SQL = """
+    INSERT INTO {target} (
+        skill_id, period_start, {columns}, recorded_at, samples
+    )
+    SELECT skill_id, {period} AS period, {columns}, MAX(recorded_at), {samples}
+    FROM {source}
+    WHERE {time_column} < :cutoff
+    GROUP BY skill_id, period
+    ON CONFLICT(skill_id, period_start) DO UPDATE SET
+        {updates},
+        recorded_at = MAX(recorded_at, excluded.recorded_at),
+        samples = samples + excluded.samples
+"""
+
+
+def _sql_datetime(value: datetime) -> str:
+    # 与 SQLAlchemy 写入 SQLite 的文本格式一致，保证字符串比较正确
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _rollup(
+    db: Session,
+    source: str,
+    target: str,
+    time_column: str,
+    period: str,
+    samples: str,
+    cutoff: datetime,
+) -> int:
+    columns = ", ".join(METRIC_COLUMNS)
+    # 已有汇总行时，只有更晚的快照才覆盖指标值
+    updates = ",\n        ".join(
+        f"{column} = CASE WHEN excluded.recorded_at >= recorded_at "
+        f"THEN excluded.{column} ELSE {column} END"
+        for column in METRIC_COLUMNS
+    )
+    db.execute(
+        text(
+            _ROLLUP_SQL.format(
+                target=target,
+                source=source,
+                columns=columns,
+                period=period,
+                samples=samples,
+                time_column=time_column,
+                updates=updates,
+            )
+        ),
+        {"cutoff": _sql_datetime(cutoff)},
+    )
+    deleted = db.execute(
+        text(f"DELETE FROM {source} WHERE {time_column} < :cutoff"),
+        {"cutoff": _sql_datetime(cutoff)},
+    )
+    return deleted.rowcount
+
+
+def compact_metrics(db: Session, now: Optional[datetime] = None) -> Dict[str, int]:
+    """把过期的原始指标汇总为日数据，再把过期的日数据汇总为周数据"""
+    now = now or datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    # 只汇总完整的自然日 / 自然周
+    raw_cutoff = today - timedelta(days=settings.metrics_raw_retention_days)
+    daily_cutoff = today - timedelta(days=settings.metrics_daily_retention_days)
+    daily_cutoff -= timedelta(days=daily_cutoff.weekday())
+
+    raw_compacted = _rollup(
+        db,
+        source="skill_metrics",
+        target="skill_metrics_daily",
+        time_column="recorded_at",
+        period="strftime('%Y-%m-%d 00:00:00.000000', recorded_at)",
+        samples="COUNT(*)",
+        cutoff=raw_cutoff,
+    )
+    daily_compacted = _rollup(
+        db,
+        source="skill_metrics_daily",
+        target="skill_metrics_weekly",
+        time_column="period_start",
+        period="strftime('%Y-%m-%d 00:00:00.000000', period_start, "
+        "'weekday 0', '-6 days')",
+        samples="SUM(samples)",
+        cutoff=daily_cutoff,
+    )
+
+    weekly_deleted = 0
+    if settings.metrics_weekly_retention_days > 0:
+        weekly_cutoff = today - timedelta(days=settings.metrics_weekly_retention_days)
+        weekly_deleted = db.execute(
+            text("DELETE FROM skill_metrics_weekly WHERE period_start < :cutoff"),
+            {"cutoff": _sql_datetime(weekly_cutoff)},
+        ).rowcount
+
+    db.commit()
+    return {
+        "raw_rows_compacted": raw_compacted,
+        "daily_rows_compacted": daily_compacted,
+        "weekly_rows_deleted": weekly_deleted,
+    }
@@ -22,6 +22,8 @@ class ScrapingScheduler:
             "pypi": PyPIScraper,
             "huggingface": HuggingFaceScraper,
         }
+        # 同一来源不并发运行，避免两次运行争抢同一份续跑进度
+        self._running = set()
 
     def start(self):
         self.scheduler.add_job(
@@ -48,6 +50,12 @@ class ScrapingScheduler:
             id="huggingface_scrape",
             replace_existing=True,
         )
+        self.scheduler.add_job(
+            self._compact_metrics,
+            IntervalTrigger(hours=settings.metrics_compaction_interval_hours),
+            id="metrics_compaction",
+            replace_existing=True,
+        )
         self.scheduler.start()
 
     def stop(self):
@@ -66,7 +74,12 @@ class ScrapingScheduler:
         await self._run_scraper("huggingface")
 
     async def _run_scraper(self, source: str):
-        from ..models.database import SessionLocal
+        from ..models.database import SessionLocal, run_in_writer
+
+        if source in self._running:
+            print(f"{source} scrape already running, skipped")
+            return
+        self._running.add(source)
 
         db = SessionLocal()
         try:
@@ -78,7 +91,21 @@ class ScrapingScheduler:
         except Exception as e:
             print(f"Error scraping {source}: {e}")
         finally:
-            db.close()
+            self._running.discard(source)
+            await run_in_writer(db.close)
+
+    async def _compact_metrics(self):
+        from ..models.database import SessionLocal, run_in_writer
+        from .retention import compact_metrics
+
+        db = SessionLocal()
+        try:
+            result = await run_in_writer(compact_metrics, db)
+            print(f"metrics compaction completed: {result}")
+        except Exception as e:
+            print(f"Error compacting metrics: {e}")
+        finally:
+            await run_in_writer(db.close)
 
     async def trigger_scrape(self, source: str):
         await self._run_scraper(source)
@@ -1,93 +1,702 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from datetime import datetime
+from collections import Counter
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+)
+from datetime import datetime, timedelta, timezone
+import asyncio
+import time
+import hashlib
+import json
+from sqlalchemy import bindparam, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from ..models.database import Skill, SkillMetrics, ScrapeLog
+from ..models.database import (
+    Skill,
+    SkillMetrics,
+    SkillLatestMetrics,
+    SkillCount,
+    ScrapeLog,
+    ScrapeCheckpoint,
+    run_in_writer,
+)
+from ..core.cache import response_cache
+from ..core.config import settings
+from .http_client import get_fetcher
+from .skill_classifier import get_classifier, skill_label
+from .trending import update_trending_scores
+
+# SQLite 限制单条语句的绑定参数数量，IN 查询按块拆分
+LOOKUP_CHUNK_SIZE = 500
+
+# 生产者结束标记
+_STREAM_END = object()
+
+# 上次爬取处于这些状态时，本次只续跑其未完成的单元
+RESUMABLE_STATUSES = ("running", "error", "partial")
+
+# 参与变更检测的字段，全部相同则视为未变化
+HASHED_FIELDS = (
+    "description",
+    "url",
+    "language",
+    "stars",
+    "forks",
+    "downloads_day",
+    "downloads_week",
+    "downloads_month",
+    "likes",
+    "last_activity",
+)
+
+# 重复条目合并时取较大值的字段
+MERGE_MAX_FIELDS = (
+    "stars",
+    "forks",
+    "downloads_day",
+    "downloads_week",
+    "downloads_month",
+    "likes",
+    "last_activity",
+)
+
+
+class _PartialItem(dict):
+    """去重产出的部分条目：只含新增字段及最大值字段，写入前补全已写入的值"""
+
+
+@dataclass
+class _UnitResult:
+    unit: str
+    items: int
+    started_at: datetime
+    duration_ms: int
+    error: Optional[str] = None
+
+
+# 同一次运行中合并后再次写入的技能：覆盖本次运行写入的那行指标，SET 列取自参数
+_REWRITE_METRICS = (
+    SkillMetrics.__table__.update()
+    .where(SkillMetrics.skill_id == bindparam("b_skill_id"))
+    .where(SkillMetrics.recorded_at == bindparam("b_recorded_at"))
+)
 
 
 class BaseScraper(ABC):
     def __init__(self, db: Session):
         self.db = db
+        self.http = get_fetcher()
+        # 本次运行内已认领 / 已产出的条目，按 canonical_name 索引
+        self._claimed = set()
+        self._merged: Dict[str, Tuple[str, FrozenSet[str], Dict[str, Any]]] = {}
+        # 本次运行已写入指标的技能，重复写入时更新该行而不是新增
+        self._metrics_written: Dict[int, datetime] = {}
+        # scrape 与 stream 默认互相调用，子类至少要实现其中一个入口
+        hooks = ("scrape", "stream", "stream_unit")
+        if not any(self._overrides(hook) for hook in hooks):
+            raise TypeError(
+                f"{type(self).__name__} must implement scrape, stream "
+                "or work_units + stream_unit"
+            )
+
+    @classmethod
+    def _overrides(cls, hook: str) -> bool:
+        return getattr(cls, hook) is not getattr(BaseScraper, hook)
 
-    @abstractmethod
     async def scrape(self) -> List[Dict[str, Any]]:
-        pass
+        """一次性返回全部条目；子类实现 scrape、stream 或 work_units + stream_unit"""
+        return [item async for item in self.stream()]
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        """逐条产出条目，run 边爬边分批写入"""
+        units = self.work_units()
+        for unit in units:
+            async for item in self.stream_unit(unit):
+                yield item
+        # 只实现了 stream_unit 时，没有工作单元即没有条目
+        if not units and self._overrides("scrape"):
+            for item in await self.scrape():
+                yield item
+
+    def work_units(self) -> List[str]:
+        """可独立完成、可续跑的工作单元（查询词、分页等）；为空时按 stream 整体爬取"""
+        return []
+
+    async def stream_unit(self, unit: str) -> AsyncIterator[Dict[str, Any]]:
+        raise NotImplementedError(
+            f"{type(self).__name__} returns work units "
+            "but does not implement stream_unit"
+        )
+        yield
 
     @abstractmethod
     def get_source_name(self) -> str:
         pass
 
-    def _log_scrape(
-        self, items_scraped: int, status: str = "success", error_message: str = None
-    ):
+    async def _paginate(
+        self,
+        first_page: List[Dict[str, Any]],
+        fetch_page: Callable[[int], Awaitable[List[Dict[str, Any]]]],
+        pages: int,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """产出首页及第 2..pages 页（并发获取、按完成顺序）"""
+        for item in first_page:
+            yield item
+
+        rest = {page: fetch_page(page) for page in range(2, pages + 1)}
+        async for _, result in self.http.iter_completed(rest):
+            if isinstance(result, Exception):
+                raise result
+            for item in result:
+                yield item
+
+    def canonical_name(self, name: str) -> str:
+        """本次运行内判断同一条目的键"""
+        return name.strip().lower()
+
+    def claim(self, name: str) -> bool:
+        """首次认领返回 True；已认领的名称本次运行不再发起详情请求"""
+        key = self.canonical_name(name)
+        if key in self._claimed:
+            return False
+        self._claimed.add(key)
+        return True
+
+    def _dedupe(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """跨查询去重：重复条目没有带来新字段或更大值时丢弃
+
+        每个键只保留合并所需的状态（首次的名称、已有值的字段、取最大值字段的当前值），
+        不保留整条数据。带来新内容时产出部分条目：只含新增字段及最大值字段，
+        未给出的字段在写入时沿用已写入的值。
+        """
+        key = self.canonical_name(item["name"])
+        filled = {
+            field
+            for field, value in item.items()
+            if value is not None and value != "" and field != "name"
+        }
+        state = self._merged.get(key)
+        if state is None:
+            maxes = {
+                field: item[field] for field in MERGE_MAX_FIELDS if field in filled
+            }
+            self._merged[key] = (item["name"], frozenset(filled), maxes)
+            return item
+
+        name, seen, maxes = state
+        added = {field: item[field] for field in filled - seen}
+        for field in filled & seen:
+            if field in maxes and item[field] > maxes[field]:
+                added[field] = item[field]
+        if not added:
+            return None
+
+        maxes.update((f, v) for f, v in added.items() if f in MERGE_MAX_FIELDS)
+        self._merged[key] = (name, seen | filled, maxes)
+        return _PartialItem({"name": name, **added, **maxes})
+
+    def _chain_started_at(self, scrape_log: ScrapeLog) -> datetime:
+        """续跑链中最初那次爬取的开始时间；续跑期限从它算起，不随每次续跑顺延"""
+        while scrape_log.resumed_from_id is not None:
+            scrape_log = self.db.get(ScrapeLog, scrape_log.resumed_from_id)
+        return scrape_log.started_at
+
+    def _start_run(self) -> Tuple[int, List[str], Optional[int]]:
+        """创建本次爬取记录；上一次未完成时只续跑其未完成的单元
+
+        上一次本身是续跑且没有完成任何单元时（如某个单元持续失败）不再续跑，
+        改为完整运行，避免反复只跑失败的单元。
+        """
+        source = self.get_source_name()
+        units = self.work_units()
+        resumed_from_id = None
+
+        previous = (
+            self.db.query(ScrapeLog)
+            .filter(ScrapeLog.source == source)
+            .order_by(ScrapeLog.id.desc())
+            .first()
+        )
+        resume_after = datetime.utcnow() - timedelta(
+            hours=settings.scrape_resume_max_age_hours
+        )
+        if units and previous and previous.status in RESUMABLE_STATUSES:
+            unfinished = {
+                checkpoint.unit
+                for checkpoint in previous.checkpoints
+                if checkpoint.status != "done"
+            }
+            made_progress = previous.resumed_from_id is None or any(
+                checkpoint.status == "done" for checkpoint in previous.checkpoints
+            )
+            if (
+                unfinished
+                and made_progress
+                and self._chain_started_at(previous) >= resume_after
+            ):
+                units = [unit for unit in units if unit in unfinished]
+                resumed_from_id = previous.id
+            if previous.status == "running":
+                # 上次进程中途退出，记录未写完
+                previous.status = "error"
+                previous.error_message = "interrupted"
+                previous.completed_at = datetime.utcnow()
+
         scrape_log = ScrapeLog(
-            source=self.get_source_name(),
-            items_scraped=items_scraped,
-            status=status,
-            error_message=error_message,
-            completed_at=datetime.utcnow(),
+            source=source, status="running", resumed_from_id=resumed_from_id
         )
+        scrape_log.checkpoints = [ScrapeCheckpoint(unit=unit) for unit in units]
         self.db.add(scrape_log)
         self.db.commit()
+        return scrape_log.id, units, resumed_from_id
 
-    async def run(self) -> Dict[str, Any]:
-        try:
-            items = await self.scrape()
-            skills_created = 0
-            skills_updated = 0
-
-            for item in items:
-                skill = (
-                    self.db.query(Skill)
-                    .filter(
-                        Skill.name == item["name"],
-                        Skill.source == self.get_source_name(),
-                    )
-                    .first()
+    def _finish_run(
+        self,
+        scrape_id: int,
+        items_scraped: int,
+        status: str = "success",
+        error_message: Optional[str] = None,
+    ):
+        scrape_log = self.db.get(ScrapeLog, scrape_id)
+        scrape_log.items_scraped = items_scraped
+        scrape_log.status = status
+        scrape_log.error_message = error_message
+        scrape_log.completed_at = datetime.utcnow()
+        self.db.commit()
+
+    def _load_existing(self, names: List[str]) -> Dict[str, Tuple[int, Optional[str]]]:
+        """按块查询已有技能的 id 及上次写入内容的哈希"""
+        source = self.get_source_name()
+        existing = {}
+        for i in range(0, len(names), LOOKUP_CHUNK_SIZE):
+            chunk = names[i : i + LOOKUP_CHUNK_SIZE]
+            rows = self.db.execute(
+                select(Skill.name, Skill.id, SkillLatestMetrics.content_hash)
+                .outerjoin(SkillLatestMetrics)
+                .where(Skill.source == source, Skill.name.in_(chunk))
+            )
+            existing.update(
+                {name: (skill_id, content_hash) for name, skill_id, content_hash in rows}
+            )
+        return existing
+
+    def _load_stored(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """已写入的技能字段及最新指标，用于补全部分条目"""
+        source = self.get_source_name()
+        columns = [
+            Skill.name,
+            Skill.description,
+            Skill.url,
+            Skill.language,
+            Skill.source_serial,
+            *(getattr(SkillLatestMetrics, field) for field in MERGE_MAX_FIELDS),
+        ]
+        stored = {}
+        for i in range(0, len(names), LOOKUP_CHUNK_SIZE):
+            chunk = names[i : i + LOOKUP_CHUNK_SIZE]
+            rows = self.db.execute(
+                select(*columns)
+                .outerjoin(SkillLatestMetrics)
+                .where(Skill.source == source, Skill.name.in_(chunk))
+            )
+            stored.update((row.name, row._asdict()) for row in rows)
+        for row in stored.values():
+            # SQLite 读出的是 naive 时间，与爬虫给出的 UTC 时间保持同一形式再计算哈希
+            if row["last_activity"] is not None:
+                row["last_activity"] = row["last_activity"].replace(tzinfo=timezone.utc)
+        return stored
+
+    @staticmethod
+    def _content_hash(item: Dict[str, Any]) -> str:
+        content = [item.get(field) for field in HASHED_FIELDS]
+        # 来源提供变更序号时一并比较，序号变化即视为变化
+        if item.get("source_serial") is not None:
+            content.append(item["source_serial"])
+        encoded = json.dumps(content, default=str, separators=(",", ":"))
+        return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+    def _bulk_upsert(self, items: List[Dict[str, Any]]) -> Dict[str, int]:
+        """批量写入：一次查询已有 key，ON CONFLICT 更新技能，executemany 写入指标
+
+        内容哈希与上次写入一致的条目不产生任何写入。
+        """
+        source = self.get_source_name()
+        now = datetime.utcnow()
+        # 同一批次内同名条目合并，后到的（去重产出的部分条目）覆盖已给出的字段
+        by_name: Dict[str, Dict[str, Any]] = {}
+        # 保存的内容哈希取自完整条目，与下次运行先到的完整条目比较
+        saved_hashes: Dict[str, str] = {}
+        merged_names = set()
+        for item in items:
+            name = item["name"]
+            previous = by_name.get(name)
+            by_name[name] = {**previous, **item} if previous else item
+            if isinstance(item, _PartialItem):
+                merged_names.add(name)
+            elif previous is None:
+                saved_hashes[name] = self._content_hash(item)
+        # 完整条目在之前的批次中，已在该批次计数
+        carried = merged_names - set(saved_hashes)
+        # 合并过的条目以已写入的值补全，变更检测与分类都按补全后的整行进行
+        stored_rows = self._load_stored(list(merged_names))
+        for name, stored in stored_rows.items():
+            given = {k: v for k, v in by_name[name].items() if v is not None}
+            by_name[name] = {**stored, **given}
+        existing = self._load_existing(list(by_name))
+
+        hashes = {name: self._content_hash(item) for name, item in by_name.items()}
+        compared = {name: content_hash for name, (_, content_hash) in existing.items()}
+        compared.update(
+            (name, self._content_hash(stored)) for name, stored in stored_rows.items()
+        )
+        changed = {
+            name: item
+            for name, item in by_name.items()
+            if name not in existing or compared[name] != hashes[name]
+        }
+        # 沿用完整条目写入的哈希
+        for name in carried:
+            stored_hash = existing.get(name, (None, None))[1]
+            saved_hashes[name] = stored_hash or hashes[name]
+
+        classifier = get_classifier()
+        skill_rows = [
+            {
+                "name": name,
+                "source": source,
+                "description": item.get("description"),
+                "url": item.get("url"),
+                "language": item.get("language"),
+                "source_serial": item.get("source_serial"),
+                # 没有描述时保留原分类（描述也保留原值）
+                "classification": (
+                    skill_label(classifier, name, item.get("description"))
+                    if item.get("description") is not None or name not in existing
+                    else None
+                ),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for name, item in changed.items()
+        ]
+        if skill_rows:
+            stmt = sqlite_insert(Skill)
+            # name 全局唯一：其他来源的同名技能不覆盖
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Skill.name],
+                # 部分条目未给出的字段保留原值
+                set_={
+                    "description": func.coalesce(
+                        stmt.excluded.description, Skill.description
+                    ),
+                    "url": func.coalesce(stmt.excluded.url, Skill.url),
+                    "language": func.coalesce(
+                        stmt.excluded.language, Skill.language
+                    ),
+                    "classification": func.coalesce(
+                        stmt.excluded.classification, Skill.classification
+                    ),
+                    "source_serial": func.coalesce(
+                        stmt.excluded.source_serial, Skill.source_serial
+                    ),
+                    "updated_at": stmt.excluded.updated_at,
+                },
+                where=Skill.source == stmt.excluded.source,
+            )
+            self.db.execute(stmt, skill_rows)
+
+        skill_ids = {
+            name: skill_id
+            for name, (skill_id, _) in self._load_existing(list(changed)).items()
+        }
+
+        metrics_rows = [
+            {
+                "skill_id": skill_ids[name],
+                "stars": item.get("stars"),
+                "forks": item.get("forks"),
+                "downloads_day": item.get("downloads_day"),
+                "downloads_week": item.get("downloads_week"),
+                "downloads_month": item.get("downloads_month"),
+                "likes": item.get("likes"),
+                "last_activity": item.get("last_activity"),
+                "recorded_at": now,
+            }
+            for name, item in changed.items()
+            if name in skill_ids
+        ]
+        # 本次运行首次写入的技能；之后的批次再次写入不重复计数
+        first_written = {
+            row["skill_id"]
+            for row in metrics_rows
+            if row["skill_id"] not in self._metrics_written
+        }
+        if metrics_rows:
+            new_rows = [
+                row
+                for row in metrics_rows
+                if row["skill_id"] not in self._metrics_written
+            ]
+            if new_rows:
+                self.db.execute(insert(SkillMetrics), new_rows)
+            rewritten = [
+                {
+                    **{k: v for k, v in row.items() if k != "skill_id"},
+                    "b_skill_id": row["skill_id"],
+                    "b_recorded_at": self._metrics_written[row["skill_id"]],
+                }
+                for row in metrics_rows
+                if row["skill_id"] in self._metrics_written
+            ]
+            if rewritten:
+                self.db.execute(_REWRITE_METRICS, rewritten)
+            self._metrics_written.update(
+                (row["skill_id"], row["recorded_at"]) for row in metrics_rows
+            )
+            hash_by_id = {skill_ids[name]: saved_hashes[name] for name in skill_ids}
+            self._upsert_latest_metrics(
+                [
+                    {**row, "content_hash": hash_by_id[row["skill_id"]]}
+                    for row in metrics_rows
+                ]
+            )
+
+        created_ids = {
+            skill_id for name, skill_id in skill_ids.items() if name not in existing
+        }
+        created = len(created_ids)
+        if created:
+            stmt = sqlite_insert(SkillCount).values(source=source, total=created)
+            self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[SkillCount.source],
+                    set_={"total": SkillCount.total + stmt.excluded.total},
                 )
+            )
+        return {
+            "skills_created": created,
+            "skills_changed": len(first_written - created_ids),
+            "skills_unchanged": sum(
+                1 for name in by_name if name not in changed and name not in carried
+            ),
+            "skills_skipped": len(changed) - len(skill_ids),
+        }
 
-                if not skill:
-                    skill = Skill(
-                        name=item["name"],
-                        source=self.get_source_name(),
-                        description=item.get("description", ""),
-                        url=item["url"],
-                        language=item.get("language"),
-                    )
-                    self.db.add(skill)
-                    skills_created += 1
-                else:
-                    skill.description = item.get("description", skill.description)
-                    skill.url = item["url"]
-                    skill.language = item.get("language", skill.language)
-                    skill.updated_at = datetime.utcnow()
-                    skills_updated += 1
-
-                self.db.flush()
-
-                metrics = SkillMetrics(
-                    skill_id=skill.id,
-                    stars=item.get("stars"),
-                    forks=item.get("forks"),
-                    downloads_day=item.get("downloads_day"),
-                    downloads_week=item.get("downloads_week"),
-                    downloads_month=item.get("downloads_month"),
-                    likes=item.get("likes"),
-                    last_activity=item.get("last_activity"),
+    def _upsert_latest_metrics(self, metrics_rows: List[Dict[str, Any]]):
+        source = self.get_source_name()
+        stmt = sqlite_insert(SkillLatestMetrics)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SkillLatestMetrics.skill_id],
+            set_={
+                column: stmt.excluded[column]
+                for column in (
+                    "stars",
+                    "forks",
+                    "downloads_day",
+                    "downloads_week",
+                    "downloads_month",
+                    "likes",
+                    "last_activity",
+                    "recorded_at",
+                    "content_hash",
                 )
-                self.db.add(metrics)
+            },
+        )
+        self.db.execute(stmt, [{**row, "source": source} for row in metrics_rows])
 
+    def _persist_batch(
+        self,
+        scrape_id: int,
+        items: List[Dict[str, Any]],
+        finished: List["_UnitResult"],
+    ) -> Dict[str, int]:
+        """写入一批条目，并在同一事务中标记已完成的工作单元"""
+        try:
+            counts = self._bulk_upsert(items) if items else {}
+            for result in finished:
+                self.db.query(ScrapeCheckpoint).filter(
+                    ScrapeCheckpoint.scrape_id == scrape_id,
+                    ScrapeCheckpoint.unit == result.unit,
+                ).update(
+                    {
+                        "status": "error" if result.error else "done",
+                        "items": result.items,
+                        "error_message": result.error,
+                        "started_at": result.started_at,
+                        "completed_at": datetime.utcnow(),
+                        "duration_ms": result.duration_ms,
+                    }
+                )
             self.db.commit()
-            self._log_scrape(items_scraped=len(items))
+        except Exception:
+            self.db.rollback()
+            raise
+        return counts
 
-            return {
-                "status": "success",
-                "items_scraped": len(items),
-                "skills_created": skills_created,
-                "skills_updated": skills_updated,
-            }
-        except Exception as e:
+    async def _produce_unit(
+        self, unit: str, queue: asyncio.Queue, semaphore: asyncio.Semaphore
+    ):
+        async with semaphore:
+            started_at = datetime.utcnow()
+            started = time.perf_counter()
+            items = 0
+            error = None
+            try:
+                async for item in self.stream_unit(unit):
+                    await queue.put(item)
+                    items += 1
+            except Exception as e:
+                print(f"Error scraping {self.get_source_name()} unit {unit}: {e}")
+                error = str(e) or type(e).__name__
+            duration_ms = int((time.perf_counter() - started) * 1000)
+            await queue.put(_UnitResult(unit, items, started_at, duration_ms, error))
+
+    async def _produce(self, queue: asyncio.Queue, units: List[str]):
+        try:
+            if units:
+                semaphore = asyncio.Semaphore(settings.scrape_unit_concurrency)
+                await asyncio.gather(
+                    *(self._produce_unit(unit, queue, semaphore) for unit in units)
+                )
+            else:
+                async for item in self.stream():
+                    await queue.put(item)
+        finally:
+            await queue.put(_STREAM_END)
+
+    async def _write_batches(
+        self, scrape_id: int, queue: asyncio.Queue, totals: Counter
+    ):
+        """按条数或时间间隔把队列中的条目分批提交；单元完成时立即提交其进度"""
+        loop = asyncio.get_running_loop()
+        batch: List[Dict[str, Any]] = []
+        finished: List[_UnitResult] = []
+        deadline = loop.time() + settings.ingest_flush_seconds
+
+        async def flush():
+            nonlocal batch, finished, deadline
+            if batch or finished:
+                counts = await run_in_writer(
+                    self._persist_batch, scrape_id, batch, finished
+                )
+                totals.update(counts)
+                totals["items_scraped"] += len(batch)
+                totals["units_failed"] += sum(1 for r in finished if r.error)
+                if counts.get("skills_created") or counts.get("skills_changed"):
+                    await response_cache.bump_generation()
+                batch = []
+                finished = []
+            deadline = loop.time() + settings.ingest_flush_seconds
+
+        while True:
+            try:
+                item = await asyncio.wait_for(
+                    queue.get(), timeout=max(deadline - loop.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+
+            if item is _STREAM_END:
+                await flush()
+                return
+            if isinstance(item, _UnitResult):
+                finished.append(item)
+                await flush()
+                continue
+            item = self._dedupe(item)
+            if item is None:
+                totals["items_deduplicated"] += 1
+                continue
+            batch.append(item)
+            if len(batch) >= settings.ingest_batch_size or loop.time() >= deadline:
+                await flush()
+
+    def _update_scores(self):
+        try:
+            update_trending_scores(self.db.connection(), self.get_source_name())
+            self.db.commit()
+        except Exception:
             self.db.rollback()
-            self._log_scrape(items_scraped=0, status="error", error_message=str(e))
             raise
+
+    async def _refresh_rankings(self):
+        """重算本来源的热度分数，使缓存失效并预先生成热门页面的响应
+
+        时间窗口随时间推移，即使本次没有变化的条目也要重算。
+        """
+        try:
+            await run_in_writer(self._update_scores)
+        except Exception as e:
+            print(f"Error updating trending scores for {self.get_source_name()}: {e}")
+        await response_cache.bump_generation()
+        if settings.response_cache_enabled and settings.response_cache_prewarm:
+            await response_cache.prewarm()
+
+    async def run(self) -> Dict[str, Any]:
+        scrape_id, units, resumed_from_id = await run_in_writer(self._start_run)
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ingest_queue_size)
+        totals: Counter = Counter()
+        producer = asyncio.create_task(self._produce(queue, units))
+
+        error: Optional[Exception] = None
+        try:
+            await self._write_batches(scrape_id, queue, totals)
+        except Exception as e:
+            error = e
+            producer.cancel()
+
+        try:
+            await producer
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            error = error or e
+
+        items_scraped = totals.pop("items_scraped", 0)
+        units_failed = totals.pop("units_failed", 0)
+        items_deduplicated = totals.pop("items_deduplicated", 0)
+        if error is None and units and units_failed == len(units):
+            error = RuntimeError(f"all {len(units)} work units failed")
+
+        await self._refresh_rankings()
+
+        if error is not None:
+            # 已提交的批次和单元保留，下次运行从未完成的单元续跑
+            status = "partial" if items_scraped else "error"
+            await run_in_writer(
+                self._finish_run, scrape_id, items_scraped, status, str(error)
+            )
+            raise error
+
+        status = "partial" if units_failed else "success"
+        await run_in_writer(
+            self._finish_run,
+            scrape_id,
+            items_scraped,
+            status,
+            f"{units_failed} work units failed" if units_failed else None,
+        )
+        return {
+            "status": status,
+            "items_scraped": items_scraped,
+            "items_deduplicated": items_deduplicated,
+            "units": len(units),
+            "units_failed": units_failed,
+            "resumed_from": resumed_from_id,
+            "skills_created": totals["skills_created"],
+            "skills_changed": totals["skills_changed"],
+            "skills_unchanged": totals["skills_unchanged"],
+            "skills_skipped": totals["skills_skipped"],
+        }
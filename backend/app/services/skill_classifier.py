@@ -0,0 +1,220 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from ..core.config import settings
+
+# 规则名 -> 关键词；均为子串匹配（与原先 `kw in text` 的语义一致）
+DEFAULT_RULES: Dict[str, List[str]] = {
+    # 描述中出现即视为技能代码
+    "skill_keywords": [
+        "example",
+        "tutorial",
+        "cookbook",
+        "guide",
+        "boilerplate",
+        "implementation",
+        "integration",
+        "sample",
+        "demo",
+        "pattern",
+        "template",
+        "snippet",
+        "starter",
+        "awesome",
+        "list",
+        "framework",
+        "library",
+        "api",
+        "sdk",
+        "client",
+        "wrapper",
+        "binding",
+    ],
+    # 名称或描述中出现、且没有技能特征时视为通用工具
+    "tool_keywords": [
+        "runtime",
+        "engine",
+        "platform",
+        "container",
+        "model",
+        "checkpoint",
+        "quantization",
+        "acceleration",
+        "deployment",
+        "serving",
+        "inference",
+        "optimization",
+    ],
+    "description_indicators": [
+        "how to",
+        "build a",
+        "create a",
+        "implementing",
+        "example of",
+        "tutorial on",
+        "guide for",
+        "step by step",
+        "walkthrough",
+        "example code",
+    ],
+    # 名称中出现即视为资源列表
+    "list_keywords": ["awesome", "list", "collection"],
+}
+
+# 各字段参与匹配的规则
+FIELD_RULES = {
+    "name": ("tool_keywords", "list_keywords"),
+    "description": ("skill_keywords", "tool_keywords", "description_indicators"),
+}
+
+SKILL_CODE = "skill_code"
+TOOL = "tool"
+LIST = "list"
+OTHER = "other"
+
+
+@dataclass
+class Classification:
+    label: str
+    # 规则名 -> 命中的关键词，用于解释分类结果
+    matches: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def is_skill_code(self) -> bool:
+        return self.label == SKILL_CODE
+
+
+def _trie_regex(node: Dict[str, dict]) -> str:
+    branches = [
+        re.escape(char) + _trie_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    # 当前前缀本身也是关键词：后续部分可选，贪婪匹配优先取更长的词
+    return f"(?:{pattern})?" if "" in node else pattern
+
+
+def compile_keywords(keywords: List[str]) -> Optional["re.Pattern[str]"]:
+    """把关键词编译成前缀树形式的正则，每个位置只需尝试首字符对应的分支"""
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        if not keyword:
+            continue
+        node = trie
+        for char in keyword.lower():
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return re.compile(_trie_regex(trie)) if trie else None
+
+
+class SkillClassifier:
+    """判断仓库是技能代码实现、资源列表还是通用工具包
+
+    规则预编译为前缀树正则；label 只做短路查找，classify 额外记录命中的关键词。
+    """
+
+    def __init__(self, rules: Optional[Dict[str, List[str]]] = None):
+        self.rules = {**DEFAULT_RULES, **(rules or {})}
+        self._patterns = {
+            rule: compile_keywords(keywords) for rule, keywords in self.rules.items()
+        }
+        # 技能关键词与描述特征在判定上等价，合并为一次查找
+        self._skill_pattern = compile_keywords(
+            self.rules["skill_keywords"] + self.rules["description_indicators"]
+        )
+        self._fields = self._compile_fields()
+
+    @staticmethod
+    def _search(pattern: Optional["re.Pattern[str]"], *texts: str) -> bool:
+        return pattern is not None and any(pattern.search(text) for text in texts)
+
+    def label(self, name: str, description: Optional[str]) -> str:
+        name = (name or "").lower()
+        description = (description or "").lower()
+
+        if self._search(self._patterns["list_keywords"], name):
+            return LIST
+        if self._search(self._skill_pattern, description):
+            return SKILL_CODE
+        if self._search(self._patterns["tool_keywords"], name, description):
+            return TOOL
+        return OTHER
+
+    def is_skill_code(self, name: str, description: Optional[str]) -> bool:
+        return self.label(name, description) == SKILL_CODE
+
+    def _compile_fields(self) -> Dict[str, tuple]:
+        """每个字段一个合并正则，以及命中词 -> [(规则, 其包含的关键词)] 的映射
+
+        正则包在零宽前瞻中，每个位置都尝试匹配，重叠的关键词（如 modelist 中的
+        model 与 list）都能找到；每个位置取最长的词，更短的前缀词由映射补全。
+        """
+        fields = {}
+        for field_name, rules in FIELD_RULES.items():
+            keywords = {kw.lower() for rule in rules for kw in self.rules[rule] if kw}
+            contained = {
+                match: [
+                    (rule, kw.lower())
+                    for rule in rules
+                    for kw in self.rules[rule]
+                    if kw and kw.lower() in match
+                ]
+                for match in keywords
+            }
+            pattern = compile_keywords(list(keywords))
+            if pattern is not None:
+                pattern = re.compile(f"(?=({pattern.pattern}))")
+            fields[field_name] = (pattern, contained)
+        return fields
+
+    def classify(self, name: str, description: Optional[str]) -> Classification:
+        """label 之外返回各规则命中的关键词；每个字段只扫描一遍"""
+        texts = {
+            "name": (name or "").lower(),
+            "description": (description or "").lower(),
+        }
+
+        matches: Dict[str, List[str]] = {}
+        for field_name, (pattern, contained) in self._fields.items():
+            if pattern is None:
+                continue
+            for match in pattern.findall(texts[field_name]):
+                for rule, keyword in contained[match]:
+                    found = matches.setdefault(rule, [])
+                    if keyword not in found:
+                        found.append(keyword)
+        return Classification(self.label(name, description), matches)
+
+
+def load_rules(path: Optional[str]) -> Dict[str, List[str]]:
+    """从 JSON 文件读取规则，未提供的规则沿用默认值"""
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        rules = json.load(f)
+    unknown = set(rules) - set(DEFAULT_RULES)
+    if unknown:
+        raise ValueError(f"Unknown classifier rules: {', '.join(sorted(unknown))}")
+    return rules
+
+
+def skill_label(
+    classifier: SkillClassifier, name: str, description: Optional[str]
+) -> str:
+    """按技能记录分类：名称取 owner/ 或 @scope/ 之后的部分"""
+    return classifier.label(name.rsplit("/", 1)[-1], description)
+
+
+_classifier: Optional[SkillClassifier] = None
+
+
+def get_classifier() -> SkillClassifier:
+    global _classifier
+    if _classifier is None:
+        _classifier = SkillClassifier(load_rules(settings.skill_classifier_rules_path))
+    return _classifier
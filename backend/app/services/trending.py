@@ -0,0 +1,147 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import DateTime, bindparam, text
+
+from ..core.config import settings
+
+# 动量特征：窗口内相邻两次快照的增量之和 / 窗口天数。
+# 未变化的条目不写指标行：窗口开始前已有快照时，窗口内没有新行即增量为 0；
+# 只有窗口开始前没有任何快照、窗口内也没有可比较的两行时才为 NULL。
+# 下载量优先用周下载，Hugging Face 只有月下载。
+VELOCITY_FEATURES = ("star_velocity", "download_velocity", "likes_velocity")
+
+
+def _latest_rollup(table: str) -> str:
+    """原始行汇总后会被删除，取最近一条日 / 周汇总快照作为之前的值"""
+    return f"""
+        SELECT c.skill_id, c.recorded_at, c.stars,
+               c.downloads_week, c.downloads_month, c.likes
+        FROM skill_latest_metrics l
+        JOIN {table} c ON c.skill_id = l.skill_id
+        WHERE {{source_filter}} AND c.period_start = (
+            SELECT MAX(period_start) FROM {table} WHERE skill_id = l.skill_id
+        )
+    """
+
+
+def _velocity(delta: str, value: str) -> str:
+    return f"""
+        CASE WHEN COUNT({delta}) > 0
+              OR MIN(CASE WHEN {value} IS NOT NULL THEN recorded_at END) < :since
+        THEN COALESCE(
+            SUM(CASE WHEN recorded_at >= :since THEN {delta} END), 0
+        ) / :days END
+    """
+
+
+def _percent_rank(feature: str) -> str:
+    """来源内按特征取百分位；该来源中缺失或没有差异的特征不参与评分"""
+    return f"""
+        CASE WHEN {feature} IS NOT NULL
+              AND MIN({feature}) OVER by_source < MAX({feature}) OVER by_source
+        THEN PERCENT_RANK() OVER (
+            PARTITION BY source, {feature} IS NULL ORDER BY {feature}
+        ) END
+    """
+
+
+_RANKED_COLUMNS = ",\n".join(
+    f"{_percent_rank(feature)} AS {feature}_rank" for feature in VELOCITY_FEATURES
+)
+_RANK_SUM = " + ".join(f"COALESCE({f}_rank, 0)" for f in VELOCITY_FEATURES)
+_RANK_COUNT = " + ".join(f"({f}_rank IS NOT NULL)" for f in VELOCITY_FEATURES)
+
+_UPDATE_SCORES_TEMPLATE = f"""
+    WITH snapshots AS (
+        SELECT m.skill_id, m.recorded_at, m.stars,
+               m.downloads_week, m.downloads_month, m.likes
+        FROM skill_latest_metrics l
+        JOIN skill_metrics m ON m.skill_id = l.skill_id
+        WHERE {{source_filter}}
+        UNION ALL
+        {_latest_rollup("skill_metrics_daily")}
+        UNION ALL
+        {_latest_rollup("skill_metrics_weekly")}
+    ),
+    deltas AS (
+        SELECT skill_id, recorded_at, stars, likes,
+               COALESCE(downloads_week, downloads_month) AS downloads,
+               stars - LAG(stars) OVER history AS d_stars,
+               COALESCE(
+                   downloads_week - LAG(downloads_week) OVER history,
+                   downloads_month - LAG(downloads_month) OVER history
+               ) AS d_downloads,
+               likes - LAG(likes) OVER history AS d_likes
+        FROM snapshots
+        WINDOW history AS (PARTITION BY skill_id ORDER BY recorded_at)
+    ),
+    velocity AS (
+        SELECT skill_id,
+               {_velocity("d_stars", "stars")} AS star_velocity,
+               {_velocity("d_downloads", "downloads")} AS download_velocity,
+               {_velocity("d_likes", "likes")} AS likes_velocity
+        FROM deltas
+        GROUP BY skill_id
+    ),
+    features AS (
+        SELECT l.skill_id, l.source,
+               -- 各来源的主要热度指标：下载量，GitHub 为 star 数
+               COALESCE(
+                   NULLIF(l.downloads_week, 0),
+                   NULLIF(l.downloads_month, 0),
+                   l.stars,
+                   l.likes,
+                   0
+               ) AS popularity,
+               v.star_velocity, v.download_velocity, v.likes_velocity
+        FROM skill_latest_metrics l
+        LEFT JOIN velocity v ON v.skill_id = l.skill_id
+        WHERE {{source_filter}}
+    ),
+    ranked AS (
+        SELECT skill_id,
+               PERCENT_RANK() OVER (PARTITION BY source ORDER BY popularity)
+                   AS popularity_rank,
+               {_RANKED_COLUMNS}
+        FROM features
+        WINDOW by_source AS (PARTITION BY source)
+    ),
+    scores AS (
+        SELECT skill_id,
+               :weight * COALESCE(
+                   ({_RANK_SUM}) / NULLIF({_RANK_COUNT}, 0), popularity_rank
+               ) + (1 - :weight) * popularity_rank AS score
+        FROM ranked
+    )
+    UPDATE skill_latest_metrics
+    SET score = scores.score
+    FROM scores
+    WHERE skill_latest_metrics.skill_id = scores.skill_id
+"""
+
+# 单来源时先按来源索引取技能，再逐个技能读取其指标历史，不扫描其他来源
+UPDATE_SCORES_SQL = _UPDATE_SCORES_TEMPLATE.format(source_filter="1")
+UPDATE_SOURCE_SCORES_SQL = _UPDATE_SCORES_TEMPLATE.format(
+    source_filter="l.source = :source"
+)
+
+
+def update_trending_scores(conn, source: Optional[str] = None):
+    """按指标历史重新计算热度分数并写入 skill_latest_metrics.score
+
+    分数在来源内归一化到 [0, 1]：动量特征百分位的均值与当前热度百分位加权，
+    没有历史的技能只看当前热度，因此不同来源可以放在一起排序。
+    source 为空时重算全部来源。
+    """
+    days = settings.trending_window_days
+    sql = UPDATE_SCORES_SQL if source is None else UPDATE_SOURCE_SCORES_SQL
+    conn.execute(
+        text(sql).bindparams(bindparam("since", type_=DateTime)),
+        {
+            "source": source,
+            "since": datetime.utcnow() - timedelta(days=days),
+            "days": float(days),
+            "weight": settings.trending_momentum_weight,
+        },
+    )
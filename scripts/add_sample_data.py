@@ -2,7 +2,16 @@ import sys
 
 sys.path.append("/Users/sophon/workspace/skill_detector/backend")
 
-from app.models.database import SessionLocal, init_db, Skill, SkillMetrics
+from app.models.database import (
+    SessionLocal,
+    engine,
+    init_db,
+    rebuild_latest_metrics,
+    rebuild_skill_counts,
+    Skill,
+    SkillMetrics,
+)
+from app.services.trending import update_trending_scores
 from sqlalchemy import func
 from datetime import datetime
 
@@ -170,6 +179,11 @@ def add_sample_skills():
 
     db.commit()
 
+    with engine.begin() as conn:
+        rebuild_latest_metrics(conn)
+        rebuild_skill_counts(conn)
+        update_trending_scores(conn)
+
     total_skills = db.query(func.count(Skill.id)).scalar()
 
     print(f"\n{'=' * 60}")
@@ -0,0 +1,31 @@
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.core.cache import response_cache
+from app.models.database import engine, init_db, read_engine
+from app.services.classification_backfill import backfill_classifications
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+    init_db()
+    started = time.perf_counter()
+    result = backfill_classifications(engine, read_engine, workers=workers)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"✅ 已扫描 {result['skills_scanned']} 个技能，"
+        f"更新 {result['skills_updated']} 个，耗时 {elapsed:.2f}s"
+    )
+
+    if result["skills_updated"]:
+        # 递增代数使缓存的 /skills 响应失效；只有 Redis 能通知到 API 进程
+        asyncio.run(response_cache.bump_generation())
+        if response_cache.stats()["backend"] != "redis":
+            print(
+                "⚠️ 未配置 Redis：API 进程内缓存的响应要到下次爬取完成或重启后才会更新"
+            )
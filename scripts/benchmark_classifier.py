@@ -0,0 +1,127 @@
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.skill_classifier import DEFAULT_RULES, FIELD_RULES, SkillClassifier
+
+WORDS = [
+    "fast",
+    "simple",
+    "python",
+    "agent",
+    "llm",
+    "chat",
+    "data",
+    "vector",
+    "search",
+    "tool",
+    "for",
+    "with",
+    "and",
+    "the",
+    "open",
+    "source",
+    "local",
+    "prompt",
+]
+
+
+def legacy_is_skill_code(name: str, description: str) -> bool:
+    """原 `_is_skill_code` 的逐关键词子串扫描，作为对照基准"""
+    name = name.lower()
+    description_lower = description.lower()
+    has_skill_keywords = any(
+        kw in description_lower for kw in DEFAULT_RULES["skill_keywords"]
+    )
+    has_tool_keywords = any(
+        kw in name or kw in description_lower for kw in DEFAULT_RULES["tool_keywords"]
+    )
+    has_description_indicators = any(
+        ind in description_lower for ind in DEFAULT_RULES["description_indicators"]
+    )
+    if any(kw in name for kw in DEFAULT_RULES["list_keywords"]):
+        return False
+    if has_tool_keywords and not has_skill_keywords and not has_description_indicators:
+        return False
+    return has_skill_keywords or has_description_indicators
+
+
+def legacy_matches(name: str, description: str) -> dict[str, set[str]]:
+    """逐关键词子串扫描得到的各规则命中词，用于核对 classify 的结果"""
+    texts = {"name": name.lower(), "description": description.lower()}
+    matches: dict[str, set[str]] = {}
+    for field_name, rules in FIELD_RULES.items():
+        for rule in rules:
+            for kw in DEFAULT_RULES[rule]:
+                if kw in texts[field_name]:
+                    matches.setdefault(rule, set()).add(kw)
+    return matches
+
+
+def _overlap_join(words: list[str]) -> str:
+    name = words[0]
+    for word in words[1:]:
+        shared = 0
+        for n in range(min(len(name), len(word)) - 1, 0, -1):
+            if name.endswith(word[:n]):
+                shared = n
+                break
+        name += word[shared:]
+    return name
+
+
+def sample_repos(count: int, seed: int = 42) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    # 约四分之一的词命中规则，接近真实仓库描述
+    vocabulary = WORDS * 10 + [kw for rule in DEFAULT_RULES.values() for kw in rule]
+    repos = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, k=rng.randint(1, 3))
+        # 名称有时直接拼接并合并首尾相同的字母（如 runtimengine），关键词会重叠
+        name = "-".join(words) if rng.random() < 0.5 else _overlap_join(words)
+        description = " ".join(rng.choices(vocabulary, k=rng.randint(0, 30)))
+        repos.append((name, description))
+    return repos
+
+
+def timed(fn, repos) -> tuple[float, list]:
+    started = time.perf_counter()
+    results = [fn(name, description) for name, description in repos]
+    return time.perf_counter() - started, results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repos = sample_repos(count)
+    classifier = SkillClassifier()
+
+    legacy_seconds, legacy = timed(legacy_is_skill_code, repos)
+    fast_seconds, fast = timed(classifier.is_skill_code, repos)
+    explained_seconds, explained = timed(classifier.classify, repos)
+
+    print(f"仓库数: {count}")
+    print(f"  逐关键词扫描:        {legacy_seconds / count * 1e6:.2f} µs/仓库")
+    print(f"  前缀树正则（判定）:  {fast_seconds / count * 1e6:.2f} µs/仓库")
+    print(f"  前缀树正则（含命中）: {explained_seconds / count * 1e6:.2f} µs/仓库")
+
+    mismatches = sum(
+        1
+        for expected, label, result in zip(legacy, fast, explained)
+        if not expected == label == result.is_skill_code
+    )
+    if mismatches:
+        print(f"❌ {mismatches} 个仓库的分类结果与原实现不一致")
+        sys.exit(1)
+    match_mismatches = sum(
+        1
+        for (name, description), result in zip(repos, explained)
+        if {rule: set(kws) for rule, kws in result.matches.items()}
+        != legacy_matches(name, description)
+    )
+    if match_mismatches:
+        print(f"❌ {match_mismatches} 个仓库的命中关键词与逐词扫描不一致")
+        sys.exit(1)
+    print("✅ 分类结果与命中关键词均与原实现一致")
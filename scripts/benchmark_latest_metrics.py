@@ -0,0 +1,152 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.api.skills import build_skills_query
+from app.models.database import Base, rebuild_latest_metrics
+from app.services.trending import update_trending_scores
+
+SOURCES = ["github", "npm", "pypi", "huggingface"]
+PAGE_SIZE = 50
+
+# 旧查询：技能直接外连接全部历史指标，每个技能按行数重复出现
+FANOUT_SQL = f"""
+    SELECT s.id FROM skills s
+    LEFT OUTER JOIN skill_metrics m ON m.skill_id = s.id
+    ORDER BY m.downloads_month DESC, s.id
+    LIMIT {PAGE_SIZE}
+"""
+
+# 参照定义：按 recorded_at 开窗，每个技能只保留第一行
+LATEST_BY_WINDOW = """
+    SELECT * FROM (
+        SELECT m.*, ROW_NUMBER() OVER (
+            PARTITION BY m.skill_id ORDER BY m.recorded_at DESC
+        ) AS rn
+        FROM skill_metrics m
+    )
+    WHERE rn = 1
+"""
+
+# 原重建方式：取每个技能最大的 id
+LATEST_BY_MAX_ID = """
+    SELECT * FROM skill_metrics
+    WHERE id IN (SELECT MAX(id) FROM skill_metrics GROUP BY skill_id)
+"""
+
+WINDOW_SQL = f"""
+    SELECT s.id FROM skills s
+    LEFT OUTER JOIN ({LATEST_BY_WINDOW}) m ON m.skill_id = s.id
+    ORDER BY m.downloads_month DESC, s.id
+    LIMIT {PAGE_SIZE}
+"""
+
+
+def populate(engine, skills: int, rows_per_skill: int, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO skills (id, name, source, url, created_at, updated_at) "
+                "VALUES (:id, :name, :source, :url, :now, :now)"
+            ),
+            [
+                {
+                    "id": skill_id,
+                    "name": f"skill-{skill_id}",
+                    "source": SOURCES[skill_id % len(SOURCES)],
+                    "url": f"https://example.com/{skill_id}",
+                    "now": now,
+                }
+                for skill_id in range(1, skills + 1)
+            ],
+        )
+        for skill_id in range(1, skills + 1):
+            base = rng.randint(0, 100000)
+            conn.execute(
+                text(
+                    "INSERT INTO skill_metrics "
+                    "(skill_id, downloads_week, downloads_month, recorded_at) "
+                    "VALUES (:skill_id, :week, :month, :recorded_at)"
+                ),
+                [
+                    {
+                        "skill_id": skill_id,
+                        "week": base + i,
+                        "month": (base + i) * 4,
+                        "recorded_at": now - timedelta(hours=rows_per_skill - i),
+                    }
+                    for i in range(rows_per_skill)
+                ],
+            )
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+if __name__ == "__main__":
+    skills = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rows_per_skill = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        print(f"写入 {skills} 个技能 × {rows_per_skill} 条指标...")
+        populate(engine, skills, rows_per_skill)
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+
+        with engine.connect() as conn:
+            fanout_seconds, fanout = timed(
+                lambda: [row[0] for row in conn.execute(text(FANOUT_SQL))]
+            )
+            window_seconds, window = timed(
+                lambda: [row[0] for row in conn.execute(text(WINDOW_SQL))]
+            )
+            max_id_seconds, _ = timed(
+                lambda: conn.execute(text(LATEST_BY_MAX_ID)).all()
+            )
+
+        with engine.begin() as conn:
+            rebuild_seconds, _ = timed(lambda: rebuild_latest_metrics(conn))
+            scores_seconds, _ = timed(lambda: update_trending_scores(conn))
+            conn.execute(text("ANALYZE"))
+
+        with Session(engine) as db:
+            query = build_skills_query(db, "used", "all").limit(PAGE_SIZE)
+            latest_seconds, latest = timed(lambda: [row.id for row in query])
+
+    print(f"指标行数: {skills * rows_per_skill}")
+    print(
+        f"  外连接全部历史:          {fanout_seconds * 1000:9.1f} ms，"
+        f"{PAGE_SIZE} 行中 {len(set(fanout))} 个不同技能"
+    )
+    print(
+        f"  ROW_NUMBER 取最新一行:   {window_seconds * 1000:9.1f} ms，"
+        f"{PAGE_SIZE} 行中 {len(set(window))} 个不同技能"
+    )
+    print(f"  MAX(id) 取最新一行:       {max_id_seconds * 1000:9.1f} ms")
+    print(f"  重建 skill_latest_metrics: {rebuild_seconds * 1000:7.1f} ms（索引相关子查询）")
+    print(f"  计算全部热度分数:        {scores_seconds * 1000:9.1f} ms")
+    print(
+        f"  读取最新指标表:          {latest_seconds * 1000:9.1f} ms，"
+        f"{PAGE_SIZE} 行中 {len(set(latest))} 个不同技能"
+    )
+
+    if len(set(window)) != len(window) or window != latest:
+        print("❌ 最新指标表与窗口查询结果不一致")
+        sys.exit(1)
+    print("✅ 每个技能只出现一次，最新指标表与窗口查询一致")
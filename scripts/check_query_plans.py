@@ -0,0 +1,81 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.api.skills import build_skills_query
+from app.models.database import ReadSessionLocal, init_db
+
+SORTS = ["latest", "hot", "used"]
+SOURCES = ["all", "github", "npm", "pypi", "huggingface"]
+
+# 每种组合期望驱动排序的索引
+EXPECTED_INDEXES = {
+    ("latest", "all"): "ix_skills_updated_at",
+    ("latest", "source"): "ix_skills_source_updated_at",
+    ("hot", "all"): "ix_latest_score",
+    ("hot", "source"): "ix_latest_source_score",
+    ("used", "all"): "ix_latest_downloads_month",
+    ("used", "source"): "ix_latest_source_downloads_month",
+}
+
+
+def explain(
+    db: Session, sort: str, source: str, limit: int = 50, after=None
+) -> list[str]:
+    query = build_skills_query(db, sort, source, after).limit(limit)
+    sql = str(
+        query.statement.compile(
+            dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def check_query_plans(db: Session) -> list[str]:
+    """返回不符合预期的查询计划，全部通过时为空列表"""
+    problems = []
+    for sort in SORTS:
+        for source in SOURCES:
+            expected = EXPECTED_INDEXES[(sort, "all" if source == "all" else "source")]
+            # 首页与游标续读页都应按索引顺序扫描
+            after = (datetime(2024, 1, 1) if sort == "latest" else 100, 1)
+            for page, plan in (
+                ("first", explain(db, sort, source)),
+                ("cursor", explain(db, sort, source, after=after)),
+            ):
+                plan_text = " | ".join(plan)
+                label = f"{sort}/{source}/{page}"
+                if "USE TEMP B-TREE FOR ORDER BY" in plan_text:
+                    problems.append(f"{label}: full sort: {plan_text}")
+                elif page == "cursor" and "SCAN " in plan_text:
+                    # 续读页应按游标值在索引中定位，而不是从头扫描
+                    problems.append(f"{label}: scan from start: {plan_text}")
+                elif expected not in plan_text:
+                    problems.append(f"{label}: expected {expected}: {plan_text}")
+    return problems
+
+
+if __name__ == "__main__":
+    init_db()
+    db = ReadSessionLocal()
+    try:
+        problems = check_query_plans(db)
+    finally:
+        db.close()
+
+    if problems:
+        print("❌ 查询计划未使用预期索引:")
+        for problem in problems:
+            print(f"  • {problem}")
+        sys.exit(1)
+
+    print(
+        f"✅ {len(SORTS) * len(SOURCES)} 个排序查询（首页及游标页）均由索引按序扫描，"
+        "游标页按索引定位"
+    )